@@ -9,15 +9,20 @@ import asyncio
 import logging
 import re
 import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
 from datetime import datetime
 from typing import Optional
 
-import httpx
+from py_clob_client.clob_types import BookParams
 
 from .config import load_settings
-from .market_lookup import fetch_market_from_slug
+from .market_lookup import close_http, extract_next_data, fetch_market_from_slug, http_client
 from .trading import (
-    get_client,
+    close_client,
+    get_account_snapshot,
+    start_keepalive,
+    warmup_client,
     place_order,
     get_positions,
     place_orders_fast,
@@ -42,19 +47,65 @@ logging.getLogger("httpx").setLevel(logging.WARNING)
 # 15min window length in seconds
 BTC_15M_WINDOW = 900
 
+# Floor for the polling interval: a 0s loop hammers the CLOB REST API into 429s
+MIN_SCAN_INTERVAL = 0.25
+
+# Polling cadence is scaled by this factor (floored at MIN_SCAN_INTERVAL) once fewer
+# than ENDGAME_SECONDS remain
+ENDGAME_SECONDS = 60
+ENDGAME_INTERVAL_FACTOR = 0.5
+
+# Market slugs: btc-updown-15m-<window start unix ts>
+_BTC_15M_SLUG_RE = re.compile(r"btc-updown-15m-(\d+)")
+# Same pattern for raw response bytes (avoids decoding whole HTML pages)
+_BTC_15M_SLUG_BYTES_RE = re.compile(rb"btc-updown-15m-(\d+)")
+
+# Prices are compared in integer ticks of $0.0001 (finer than any Polymarket tick size)
+PRICE_TICKS_PER_DOLLAR = 10_000
+
+
+def _to_ticks(price: float) -> int:
+    """Convert a dollar price to integer ticks for exact threshold comparisons."""
+    return int(round(price * PRICE_TICKS_PER_DOLLAR))
+
+
+# Long-lived worker threads for blocking CLOB calls made from the event loop.
+# Reused across scans (and market rollovers) instead of dispatching per call.
+_io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="arb-io")
+
+
+def format_remaining(remaining: Optional[float]) -> str:
+    """Format seconds-until-close for logs."""
+    if remaining is None:
+        return "Unknown"
+    if remaining <= 0:
+        return "CLOSED"
+    minutes = int(remaining // 60)
+    seconds = int(remaining % 60)
+    return f"{minutes}m {seconds}s"
+
+
+def _slug_start_ts(slug: str) -> Optional[int]:
+    """Window start timestamp encoded in a btc-updown-15m-<ts> slug (None if not that format)."""
+    slug = slug.split("?")[0]
+    if not slug.startswith("btc-updown-15m-"):
+        return None
+    ts = slug.rpartition("-")[2]
+    return int(ts) if ts.isdigit() else None
+
 
 def _find_btc_15m_via_computed_slugs() -> Optional[str]:
     """
     Try computed slugs for current and next 15m windows (reference: try event URLs).
     Slug format: btc-updown-15m-{ts_rounded} where ts_rounded aligns to 15m boundaries.
     """
-    now_ts = int(datetime.now().timestamp())
+    now_ts = int(time.time())
     for i in range(7):
         ts = now_ts + (i * BTC_15M_WINDOW)
         ts_rounded = (ts // BTC_15M_WINDOW) * BTC_15M_WINDOW
         slug = f"btc-updown-15m-{ts_rounded}"
         try:
-            logger.info(f"  Checking: {slug}")
+            logger.info("  Checking: %s", slug)
             fetch_market_from_slug(slug)
             # Market page exists and has valid data; use it if still open
             if now_ts < ts_rounded + BTC_15M_WINDOW:
@@ -68,36 +119,30 @@ def _find_btc_15m_via_computed_slugs() -> Optional[str]:
 def _find_btc_15m_via_gamma_api() -> Optional[str]:
     """Find BTC 15m slug from Polymarket Gamma API (closed=false markets)."""
     try:
-        resp = httpx.get(
+        resp = http_client().get(
             "https://gamma-api.polymarket.com/markets",
             params={"closed": "false", "limit": 500},
-            headers={"User-Agent": "Mozilla/5.0"},
-            timeout=15,
+            timeout=15,  # 500-market listing is larger than the single-slug lookups
         )
         resp.raise_for_status()
         data = resp.json()
         if not isinstance(data, list):
             return None
-        now_ts = int(datetime.now().timestamp())
-        pattern = re.compile(r"^btc-updown-15m-(\d+)$")
-        candidates = []
+        now_ts = int(time.time())
+        pattern = _BTC_15M_SLUG_RE
+        # Single pass: newest still-open window wins, else the newest seen at all
+        latest = latest_open = None  # (ts, slug)
         for m in data:
-            slug = (m.get("slug") or "").strip()
-            mo = pattern.match(slug)
+            mo = pattern.fullmatch((m.get("slug") or "").strip())
             if not mo:
                 continue
             ts = int(mo.group(1))
-            if now_ts < ts + BTC_15M_WINDOW:
-                candidates.append((ts, slug))
-        if not candidates:
-            for m in data:
-                slug = (m.get("slug") or "").strip()
-                if pattern.match(slug):
-                    candidates.append((int(pattern.match(slug).group(1)), slug))
-        if not candidates:
-            return None
-        candidates.sort(key=lambda x: (x[0] + BTC_15M_WINDOW > now_ts, x[0]), reverse=True)
-        return candidates[0][1]
+            if latest is None or ts > latest[0]:
+                latest = (ts, mo.group(0))
+            if now_ts < ts + BTC_15M_WINDOW and (latest_open is None or ts > latest_open[0]):
+                latest_open = (ts, mo.group(0))
+        chosen = latest_open or latest
+        return chosen[1] if chosen else None
     except Exception as e:
         logger.debug("Gamma API lookup failed: %s", e)
         return None
@@ -106,27 +151,28 @@ def _find_btc_15m_via_gamma_api() -> Optional[str]:
 def _find_btc_15m_via_page_scrape() -> Optional[str]:
     """Fallback: scrape crypto/15M page for btc-updown-15m slugs (HTML or __NEXT_DATA__)."""
     try:
-        import json
-        resp = httpx.get(
+        resp = http_client().get(
             "https://polymarket.com/crypto/15M",
             headers={"User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36"},
-            timeout=15,
         )
         resp.raise_for_status()
-        text = resp.text
-        now_ts = int(datetime.now().timestamp())
-        pattern = re.compile(r"^btc-updown-15m-(\d+)$")
-        # Plain regex in HTML
-        matches = re.findall(r"btc-updown-15m-(\d+)", text)
-        if matches:
-            all_ts = sorted(set(int(ts) for ts in matches), reverse=True)
-            open_ts = [t for t in all_ts if now_ts < t + BTC_15M_WINDOW]
-            chosen = open_ts[0] if open_ts else all_ts[0]
+        now_ts = int(time.time())
+        pattern = _BTC_15M_SLUG_RE
+        # Single pass over the raw HTML bytes (no decode, no match list): track the
+        # newest window overall and the newest one still open.
+        latest = latest_open = None
+        for mo in _BTC_15M_SLUG_BYTES_RE.finditer(resp.content):
+            ts = int(mo.group(1))
+            if latest is None or ts > latest:
+                latest = ts
+            if now_ts < ts + BTC_15M_WINDOW and (latest_open is None or ts > latest_open):
+                latest_open = ts
+        if latest is not None:
+            chosen = latest_open if latest_open is not None else latest
             return f"btc-updown-15m-{chosen}"
         # __NEXT_DATA__
-        m = re.search(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', text, re.DOTALL)
-        if m:
-            payload = json.loads(m.group(1))
+        payload = extract_next_data(resp.text)
+        if payload is not None:
             queries = (payload.get("props") or {}).get("pageProps", {}).get("dehydratedState", {}).get("queries") or []
             for q in queries:
                 data = q.get("state", {}).get("data")
@@ -134,12 +180,12 @@ def _find_btc_15m_via_page_scrape() -> Optional[str]:
                     continue
                 for ev in (data.get("events") or []) + (data.get("markets") or []):
                     slug = (ev.get("slug") or "").strip()
-                    if pattern.match(slug):
+                    if pattern.fullmatch(slug):
                         return slug
             def find_slugs(obj):
                 if isinstance(obj, dict):
                     s = obj.get("slug")
-                    if isinstance(s, str) and pattern.match(s):
+                    if isinstance(s, str) and pattern.fullmatch(s):
                         return [s]
                     return [x for v in obj.values() for x in find_slugs(v)]
                 if isinstance(obj, list):
@@ -186,12 +232,66 @@ def get_active_btc_15m_slug() -> str:
     )
 
 
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an endpoint whose circuit breaker is open."""
+
+
+@dataclass(slots=True)
+class CircuitBreaker:
+    """Consecutive-failure breaker: opens after `threshold` failures for `cooldown` seconds."""
+
+    name: str
+    threshold: int = 5
+    cooldown: float = 60.0
+    failures: int = 0
+    opened_at: Optional[float] = None
+
+    def allow(self) -> bool:
+        if self.opened_at is None:
+            return True
+        if time.monotonic() - self.opened_at >= self.cooldown:
+            # Half-open: let one trial call through; another failure re-opens immediately
+            self.opened_at = None
+            return True
+        return False
+
+    def retry_in(self) -> float:
+        """Seconds until the breaker half-opens (0 when closed)."""
+        if self.opened_at is None:
+            return 0.0
+        return max(0.0, self.opened_at + self.cooldown - time.monotonic())
+
+    def backoff(self) -> float:
+        """Exponential delay to apply after consecutive failures (1, 2, 4, ... capped at cooldown)."""
+        if not self.failures:
+            return 0.0
+        return min(self.cooldown, 2.0 ** (self.failures - 1))
+
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        if self.failures >= self.threshold and self.opened_at is None:
+            self.opened_at = time.monotonic()
+            logger.warning(
+                "Circuit %s OPEN after %d consecutive failures; pausing calls for %.0fs",
+                self.name, self.failures, self.cooldown,
+            )
+
+
 class Btc15mArbBot:
     """BTC 15-minute arbitrage bot for Polymarket UP/DOWN markets."""
     
     def __init__(self, settings):
         self.settings = settings
-        self.client = get_client(settings)
+        self._init_runtime_caches()
+        # Stops scans from hammering /books (and tripping 429s) while the CLOB is failing
+        self._book_breaker = CircuitBreaker("order-books")
+        # Client setup (API creds, TLS, first balance read) doesn't depend on the
+        # market, so it runs on a worker while this thread discovers the market.
+        client_future = _io_executor.submit(warmup_client, settings)
         
         # Try to find current BTC 15min market automatically
         try:
@@ -199,30 +299,49 @@ class Btc15mArbBot:
         except Exception as e:
             # Fallback: use the slug configured in .env
             if settings.market_slug:
-                logger.info(f"Using configured market: {settings.market_slug}")
+                logger.info("Using configured market: %s", settings.market_slug)
                 market_slug = settings.market_slug
             else:
                 raise RuntimeError("Could not find BTC 15min market and no slug configured in .env")
-        
+
         # Get token IDs from the market
-        logger.info(f"Getting market information: {market_slug}")
+        logger.info("Getting market information: %s", market_slug)
         market_info = fetch_market_from_slug(market_slug)
+
+        self.client = client_future.result()
+        self._rebind_market(market_slug, market_info)
+
+    def _init_runtime_caches(self) -> None:
+        """Precompute per-scan constants from the (immutable) settings."""
+        self._target_ticks = _to_ticks(self.settings.target_pair_cost)
+        self._order_size = float(self.settings.order_size)
+
+    def _rebind_market(self, market_slug: str, market_info: Optional[dict] = None) -> None:
+        """Point the bot at `market_slug` and reset per-market state, keeping the CLOB client."""
+        if market_info is None:
+            # Get token IDs from the market
+            logger.info("Getting market information: %s", market_slug)
+            market_info = fetch_market_from_slug(market_slug)
         
         self.market_id = market_info["market_id"]
         self.yes_token_id = market_info["yes_token_id"]
         self.no_token_id = market_info["no_token_id"]
         
-        logger.info(f"Market ID: {self.market_id}")
-        logger.info(f"UP Token (YES): {self.yes_token_id}")
-        logger.info(f"DOWN Token (NO): {self.no_token_id}")
+        logger.info("Market ID: %s", self.market_id)
+        logger.info("UP Token (YES): %s", self.yes_token_id)
+        logger.info("DOWN Token (NO): %s", self.no_token_id)
         
         # Extract market timestamp to calculate remaining time
         # The timestamp in the slug is when it OPENS, not when it closes
         # 15min markets close 15 minutes (900 seconds) later
-        import re
-        match = re.search(r'btc-updown-15m-(\d+)', market_slug)
-        market_start = int(match.group(1)) if match else None
+        market_start = _slug_start_ts(market_slug)
         self.market_end_timestamp = market_start + 900 if market_start else None  # +15 min
+        # Same deadline on the monotonic clock, so hot-path close checks are a float compare
+        self._end_monotonic = (
+            time.monotonic() + (self.market_end_timestamp - time.time())
+            if self.market_end_timestamp
+            else None
+        )
         self.market_slug = market_slug
         
         self.last_check = None
@@ -234,32 +353,54 @@ class Btc15mArbBot:
         self.total_shares_bought = 0
         self.positions = []  # List of open positions
         
-        # Cached balance (updated after each trade)
-        self.cached_balance = None
-        
         # Simulation balance (used in dry_run mode)
         self.sim_balance = self.settings.sim_balance if self.settings.sim_balance > 0 else 100.0
         self.sim_start_balance = self.sim_balance
 
-        # Simple cooldown to avoid repeated orders on the same fleeting opportunity
-        self._last_execution_ts = 0.0
+        # Last (up_book, down_book, fill_up, fill_down) computed by _buy_fills
+        self._fills_cache: Optional[tuple] = None
+
+        # Simple cooldown to avoid repeated orders on the same fleeting opportunity (monotonic seconds)
+        self._last_execution_ts: Optional[float] = None
+
+        self.warmup()
+
+    def warmup(self) -> None:
+        """
+        Prime connections and per-token client caches before the first real scan.
+
+        One /books fetch opens the pooled CLOB connection and fills the client's
+        tick-size cache; fee rates are fetched up front because create_order
+        would otherwise look them up (one GET per leg) while signing.
+        """
+        started = time.perf_counter()
+        try:
+            fee_futures = [
+                _io_executor.submit(self.client.get_fee_rate_bps, token_id)
+                for token_id in (self.yes_token_id, self.no_token_id)
+            ]
+            self._fetch_order_books()
+            for fut in fee_futures:
+                fut.result()
+        except Exception as e:
+            logger.warning("Warmup failed (first scan will pay connection setup): %s", e)
+            return
+        logger.info("Warmup done in %.0f ms", (time.perf_counter() - started) * 1000)
     
+    def seconds_remaining(self) -> Optional[float]:
+        """Seconds until the market closes (negative once closed, None if unknown)."""
+        if self._end_monotonic is None:
+            return None
+        return self._end_monotonic - time.monotonic()
+
     def get_time_remaining(self) -> str:
-        """Get remaining time until market closes."""
-        if not self.market_end_timestamp:
-            return "Unknown"
-        
-        from datetime import datetime
-        now = int(datetime.now().timestamp())
-        remaining = self.market_end_timestamp - now
-        
-        if remaining <= 0:
-            return "CLOSED"
-        
-        minutes = int(remaining // 60)
-        seconds = int(remaining % 60)
-        return f"{minutes}m {seconds}s"
+        """Get remaining time until market closes (for display)."""
+        return format_remaining(self.seconds_remaining())
     
+    def _market_closed(self) -> bool:
+        """Cheap close check for hot loops (no datetime construction)."""
+        return self._end_monotonic is not None and time.monotonic() >= self._end_monotonic
+
     def get_balance(self) -> float:
         """Get current USDC balance (or simulated balance in dry_run mode)."""
         if self.settings.dry_run:
@@ -278,9 +419,8 @@ class Btc15mArbBot:
             (up_price, down_price, up_size, down_size) - prices and available sizes
         """
         try:
-            # Get order book for both tokens
-            up_book = self.get_order_book(self.yes_token_id)
-            down_book = self.get_order_book(self.no_token_id)
+            # Get order book for both tokens (concurrently)
+            up_book, down_book = self._fetch_order_books()
             
             # Use best_ask (lowest sell price = price we can buy at)
             price_up = up_book.get("best_ask")
@@ -297,7 +437,7 @@ class Btc15mArbBot:
             
             return price_up, price_down, size_up, size_down
         except Exception as e:
-            logger.error(f"Error getting prices: {e}")
+            logger.error("Error getting prices: %s", e)
             return None, None, None, None
 
     def _levels_to_tuples(self, levels) -> list[tuple[float, float]]:
@@ -318,6 +458,9 @@ class Btc15mArbBot:
         """
         Compute fill information for buying `target_size` shares using the ask book.
 
+        `asks` must be sorted cheapest first (as produced by _parse_order_book
+        and L2BookState.to_levels), so the walk stops as soon as the size is filled.
+
         Returns:
             dict with keys: filled, vwap, worst, best, cost
             or None if not enough liquidity.
@@ -325,14 +468,12 @@ class Btc15mArbBot:
         if target_size <= 0:
             return None
 
-        # Cheapest asks first
-        sorted_asks = sorted(asks, key=lambda x: x[0])
         filled = 0.0
         cost = 0.0
         worst = None
-        best = sorted_asks[0][0] if sorted_asks else None
+        best = asks[0][0] if asks else None
 
-        for price, size in sorted_asks:
+        for price, size in asks:
             if filled >= target_size:
                 break
             take = min(size, target_size - filled)
@@ -352,59 +493,106 @@ class Btc15mArbBot:
             "cost": cost,
         }
     
-    def get_order_book(self, token_id: str) -> dict:
-        """Get order book for a token."""
-        try:
-            book = self.client.get_order_book(token_id=token_id)
-            # The result is an OrderBookSummary object, not a dict
-            bids = book.bids if hasattr(book, 'bids') and book.bids else []
-            asks = book.asks if hasattr(book, 'asks') and book.asks else []
+    def _buy_fills(self, up_book: dict, down_book: dict) -> tuple[Optional[dict], Optional[dict]]:
+        """Fill estimates for ORDER_SIZE on both books, reused for the same pair of snapshots."""
+        cached = self._fills_cache
+        if cached is not None and cached[0] is up_book and cached[1] is down_book:
+            return cached[2], cached[3]
+
+        order_size = self._order_size
+        fill_up = self._compute_buy_fill(up_book.get("asks", []), order_size)
+        fill_down = self._compute_buy_fill(down_book.get("asks", []), order_size)
+        self._fills_cache = (up_book, down_book, fill_up, fill_down)
+        return fill_up, fill_down
+
+    def _parse_order_book(self, book) -> dict:
+        """Normalize an OrderBookSummary into the bot's book dict."""
+        # The result is an OrderBookSummary object, not a dict
+        bids = book.bids if hasattr(book, 'bids') and book.bids else []
+        asks = book.asks if hasattr(book, 'asks') and book.asks else []
+
+        bid_levels = self._levels_to_tuples(bids)
+        ask_levels = self._levels_to_tuples(asks)
+        # Sort once per fetch (cheapest ask first) so fill walks don't re-sort every scan
+        ask_levels.sort(key=lambda x: x[0])
 
-            bid_levels = self._levels_to_tuples(bids)
-            ask_levels = self._levels_to_tuples(asks)
+        best_bid = max((p for p, _ in bid_levels), default=None)
+        best_ask = min((p for p, _ in ask_levels), default=None)
 
-            best_bid = max((p for p, _ in bid_levels), default=None)
-            best_ask = min((p for p, _ in ask_levels), default=None)
+        bid_size = 0.0
+        if best_bid is not None:
+            for p, s in bid_levels:
+                if p == best_bid:
+                    bid_size = s
+                    break
 
-            bid_size = 0.0
-            if best_bid is not None:
-                for p, s in bid_levels:
-                    if p == best_bid:
-                        bid_size = s
-                        break
+        ask_size = 0.0
+        if best_ask is not None:
+            for p, s in ask_levels:
+                if p == best_ask:
+                    ask_size = s
+                    break
 
-            ask_size = 0.0
-            if best_ask is not None:
-                for p, s in ask_levels:
-                    if p == best_ask:
-                        ask_size = s
-                        break
+        spread = (best_ask - best_bid) if (best_bid is not None and best_ask is not None) else None
 
-            spread = (best_ask - best_bid) if (best_bid is not None and best_ask is not None) else None
+        return {
+            "best_bid": best_bid,
+            "best_ask": best_ask,
+            "spread": spread,
+            "bid_size": bid_size,
+            "ask_size": ask_size,
+            "bids": bid_levels,
+            "asks": ask_levels,
+        }
 
-            return {
-                "best_bid": best_bid,
-                "best_ask": best_ask,
-                "spread": spread,
-                "bid_size": bid_size,
-                "ask_size": ask_size,
-                "bids": bid_levels,
-                "asks": ask_levels,
-            }
+    def get_order_book(self, token_id: str) -> dict:
+        """Get order book for a token."""
+        try:
+            return self._parse_order_book(self.client.get_order_book(token_id=token_id))
         except Exception as e:
-            logger.error(f"Error getting order book: {e}")
+            logger.error("Error getting order book: %s", e)
             return {}
 
-    async def _fetch_order_books_parallel(self) -> tuple[dict, dict]:
-        """Fetch UP/DOWN order books concurrently to reduce per-scan latency."""
+    def get_order_books(self, token_ids: list[str]) -> dict[str, dict]:
+        """Get order books for several tokens in one POST /books round-trip."""
+        books = self.client.get_order_books([BookParams(token_id=t) for t in token_ids])
+        return {str(book.asset_id): self._parse_order_book(book) for book in books}
+
+    def _fetch_order_books(self) -> tuple[dict, dict]:
+        """
+        Fetch UP/DOWN order books with a single batched request.
+
+        Raises CircuitOpenError while the order-book breaker is open.
+        """
+        breaker = self._book_breaker
+        if not breaker.allow():
+            raise CircuitOpenError(f"order-books circuit open; retry in {breaker.retry_in():.0f}s")
+
         try:
-            up_task = asyncio.to_thread(self.get_order_book, self.yes_token_id)
-            down_task = asyncio.to_thread(self.get_order_book, self.no_token_id)
-            up_book, down_book = await asyncio.gather(up_task, down_task)
-            return up_book, down_book
+            books = self.get_order_books([self.yes_token_id, self.no_token_id])
+            up_book = books.get(self.yes_token_id)
+            down_book = books.get(self.no_token_id)
+            if up_book is not None and down_book is not None:
+                breaker.record_success()
+                return up_book, down_book
+            logger.warning("Batched order book response missing a token; fetching individually")
         except Exception as e:
-            logger.warning(f"Parallel order book fetch failed, falling back to sequential: {e}")
-            return self.get_order_book(self.yes_token_id), self.get_order_book(self.no_token_id)
+            logger.warning("Batched order book fetch failed, fetching individually: %s", e)
+
+        # UP goes to a worker thread while this thread fetches DOWN
+        up_future = _io_executor.submit(self.get_order_book, self.yes_token_id)
+        down_book = self.get_order_book(self.no_token_id)
+        up_book = up_future.result()
+        if up_book and down_book:
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        return up_book, down_book
+
+    async def _fetch_order_books_parallel(self) -> tuple[dict, dict]:
+        """Fetch UP/DOWN order books without blocking the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(_io_executor, self._fetch_order_books)
     
     def check_arbitrage(self, up_book: Optional[dict] = None, down_book: Optional[dict] = None) -> Optional[dict]:
         """
@@ -416,6 +604,8 @@ class Btc15mArbBot:
         Returns dict with information if opportunity exists, None otherwise.
         """
         # Pull full order books (allow caller to pass pre-fetched books to reduce latency)
+        if up_book is None and down_book is None:
+            up_book, down_book = self._fetch_order_books()
         if up_book is None:
             up_book = self.get_order_book(self.yes_token_id)
         if down_book is None:
@@ -427,16 +617,23 @@ class Btc15mArbBot:
             best_ask = book.get("best_ask")
             if best_bid is not None and best_ask is not None and best_ask < best_bid:
                 logger.warning(
-                    f"{side_name} order book looks inverted (best_ask={best_ask:.4f} < best_bid={best_bid:.4f}); skipping scan"
+                    "%s order book looks inverted (best_ask=%.4f < best_bid=%.4f); skipping scan",
+                    side_name, best_ask, best_bid,
                 )
                 return None
 
-        asks_up = up_book.get("asks", [])
-        asks_down = down_book.get("asks", [])
+        # The worst fill price is never below the best ask, so if the best asks alone
+        # exceed the threshold there is no opportunity; skip walking the books.
+        best_ask_up = up_book.get("best_ask")
+        best_ask_down = down_book.get("best_ask")
+        if best_ask_up is None or best_ask_down is None:
+            return None
+        target_ticks = self._target_ticks
+        if _to_ticks(best_ask_up) + _to_ticks(best_ask_down) > target_ticks:
+            return None
 
         # Compute the prices required to actually fill ORDER_SIZE shares (walk the book)
-        fill_up = self._compute_buy_fill(asks_up, float(self.settings.order_size))
-        fill_down = self._compute_buy_fill(asks_down, float(self.settings.order_size))
+        fill_up, fill_down = self._buy_fills(up_book, down_book)
 
         if not fill_up or not fill_down:
             return None
@@ -449,13 +646,15 @@ class Btc15mArbBot:
 
         total_cost = limit_price_up + limit_price_down
 
-        # Use <= to avoid missing exact-threshold opportunities due to rounding
-        if total_cost <= self.settings.target_pair_cost:
+        # Compare in integer ticks: float sums like 0.053 + 0.937 = 0.9900000000000001
+        # would otherwise miss exact-threshold opportunities.
+        total_ticks = _to_ticks(limit_price_up) + _to_ticks(limit_price_down)
+        if total_ticks <= target_ticks:
             profit = 1.0 - total_cost
             profit_pct = (profit / total_cost) * 100 if total_cost > 0 else 0
 
-            investment = total_cost * self.settings.order_size
-            expected_payout = 1.0 * self.settings.order_size
+            investment = total_cost * self._order_size
+            expected_payout = self._order_size
             expected_profit = expected_payout - investment
 
             return {
@@ -475,53 +674,80 @@ class Btc15mArbBot:
                 "best_ask_down": fill_down.get("best"),
                 "vwap_up": fill_up.get("vwap"),
                 "vwap_down": fill_down.get("vwap"),
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": time.time(),  # epoch seconds; formatted only when displayed
             }
 
         return None
     
+    def _log_opportunity(self, opportunity: dict) -> None:
+        """Log the opportunity header as a single multi-line record."""
+        lines = [
+            "=" * 70,
+            "🎯 ARBITRAGE OPPORTUNITY DETECTED",
+            "=" * 70,
+        ]
+        detected_at = opportunity.get("timestamp")
+        if detected_at is not None:
+            # Stored as epoch seconds; only rendered here, when the header is actually logged
+            lines.append(f"Detected at:          {datetime.fromtimestamp(detected_at).isoformat(timespec='milliseconds')}")
+        lines += [
+            f"UP limit price:       ${opportunity['price_up']:.4f}",
+            f"DOWN limit price:     ${opportunity['price_down']:.4f}",
+        ]
+        if 'vwap_up' in opportunity and 'vwap_down' in opportunity:
+            lines.append(f"UP VWAP (est):        ${opportunity['vwap_up']:.4f}")
+            lines.append(f"DOWN VWAP (est):      ${opportunity['vwap_down']:.4f}")
+        lines += [
+            f"Total cost:           ${opportunity['total_cost']:.4f}",
+            f"Profit per share:     ${opportunity['profit_per_share']:.4f}",
+            f"Profit %:             {opportunity['profit_pct']:.2f}%",
+            "-" * 70,
+            f"Order size:           {opportunity['order_size']} shares each side",
+            f"Total investment:     ${opportunity['total_investment']:.2f}",
+            f"Expected payout:      ${opportunity['expected_payout']:.2f}",
+            f"EXPECTED PROFIT:      ${opportunity['expected_profit']:.2f}",
+            "=" * 70,
+        ]
+        logger.info("\n".join(lines))
+
     def execute_arbitrage(self, opportunity: dict):
         """Execute arbitrage by buying both sides."""
 
         # Cooldown guard (applies to both live and dry-run)
-        now = asyncio.get_event_loop().time() if asyncio.get_event_loop().is_running() else time.time()
-        if self.settings.cooldown_seconds and (now - self._last_execution_ts) < float(self.settings.cooldown_seconds):
-            logger.info(f"Cooldown active ({self.settings.cooldown_seconds}s); skipping execution")
+        now = time.monotonic()
+        if (
+            self.settings.cooldown_seconds
+            and self._last_execution_ts is not None
+            and (now - self._last_execution_ts) < float(self.settings.cooldown_seconds)
+        ):
+            logger.info("Cooldown active (%ss); skipping execution", self.settings.cooldown_seconds)
             return
         self._last_execution_ts = now
         
         # Count opportunity found (regardless of execution)
         self.opportunities_found += 1
         
-        logger.info("=" * 70)
-        logger.info("🎯 ARBITRAGE OPPORTUNITY DETECTED")
-        logger.info("=" * 70)
-        logger.info(f"UP limit price:       ${opportunity['price_up']:.4f}")
-        logger.info(f"DOWN limit price:     ${opportunity['price_down']:.4f}")
-        if 'vwap_up' in opportunity and 'vwap_down' in opportunity:
-            logger.info(f"UP VWAP (est):        ${opportunity['vwap_up']:.4f}")
-            logger.info(f"DOWN VWAP (est):      ${opportunity['vwap_down']:.4f}")
-        logger.info(f"Total cost:           ${opportunity['total_cost']:.4f}")
-        logger.info(f"Profit per share:     ${opportunity['profit_per_share']:.4f}")
-        logger.info(f"Profit %:             {opportunity['profit_pct']:.2f}%")
-        logger.info("-" * 70)
-        logger.info(f"Order size:           {opportunity['order_size']} shares each side")
-        logger.info(f"Total investment:     ${opportunity['total_investment']:.2f}")
-        logger.info(f"Expected payout:      ${opportunity['expected_payout']:.2f}")
-        logger.info(f"EXPECTED PROFIT:      ${opportunity['expected_profit']:.2f}")
-        logger.info("=" * 70)
+        # Skip formatting the header entirely when INFO is filtered out
+        if logger.isEnabledFor(logging.INFO):
+            self._log_opportunity(opportunity)
         
         if self.settings.dry_run:
             logger.info("🔸 SIMULATION MODE - No real orders will be executed")
             
             # Check simulated balance
             if self.sim_balance < opportunity['total_investment']:
-                logger.error(f"❌ Insufficient simulated balance: need ${opportunity['total_investment']:.2f} but have ${self.sim_balance:.2f}")
+                logger.error(
+                    "❌ Insufficient simulated balance: need $%.2f but have $%.2f",
+                    opportunity['total_investment'], self.sim_balance,
+                )
                 return
             
             # Deduct from simulated balance
             self.sim_balance -= opportunity['total_investment']
-            logger.info(f"💰 Simulated balance: ${self.sim_balance:.2f} (after deducting ${opportunity['total_investment']:.2f})")
+            logger.info(
+                "💰 Simulated balance: $%.2f (after deducting $%.2f)",
+                self.sim_balance, opportunity['total_investment'],
+            )
             
             # Track simulated investment
             self.total_invested += opportunity['total_investment']
@@ -533,20 +759,15 @@ class Btc15mArbBot:
         
         # Check balance before executing (with 20% safety margin)
         logger.info("\nVerifying balance...")
-        # Use cached balance if available, otherwise fetch from API
-        if self.cached_balance is not None:
-            current_balance = self.cached_balance
-            logger.info(f"Available balance (cached): ${current_balance:.2f}")
-        else:
-            current_balance = self.get_balance()
-            self.cached_balance = current_balance
-            logger.info(f"Available balance: ${current_balance:.2f}")
+        # trading.get_balance reuses a reading younger than BALANCE_TTL_SECONDS
+        current_balance = self.get_balance()
+        logger.info("Available balance: $%.2f", current_balance)
         
         required_balance = opportunity['total_investment'] * 1.2  # 20% safety margin
-        logger.info(f"Required (+ 20% margin): ${required_balance:.2f}")
+        logger.info("Required (+ 20%% margin): $%.2f", required_balance)
         
         if current_balance < required_balance:
-            logger.error(f"❌ Insufficient balance: need ${required_balance:.2f} but have ${current_balance:.2f}")
+            logger.error("❌ Insufficient balance: need $%.2f but have $%.2f", required_balance, current_balance)
             logger.error("20% extra margin required to avoid mid-execution failures")
             logger.error("Arbitrage will not be executed")
             return
@@ -575,12 +796,19 @@ class Btc15mArbBot:
                 }
             ]
             
-            logger.info(f"   UP:   {self.settings.order_size} shares @ ${up_price:.4f}")
-            logger.info(f"   DOWN: {self.settings.order_size} shares @ ${down_price:.4f}")
-            logger.info(f"   OrderType: {getattr(self.settings, 'order_type', 'GTC')}")
+            logger.info(
+                "   UP:   %s shares @ $%.4f\n   DOWN: %s shares @ $%.4f\n   OrderType: %s",
+                self.settings.order_size, up_price,
+                self.settings.order_size, down_price,
+                self.settings.order_type,
+            )
             
             # Execute both orders as fast as possible
-            results = place_orders_fast(self.settings, orders, order_type=getattr(self.settings, 'order_type', 'GTC'))
+            results = place_orders_fast(self.settings, orders, order_type=self.settings.order_type)
+            if any(isinstance(r, dict) and r.get("status") == "unconfirmed" for r in results or ()):
+                # Submit timed out; the legs may still have filled, so this is not "NOT executed"
+                self._settle_unconfirmed_submission(opportunity, results)
+                return
 
             # Extract order ids and surface any immediate submission errors.
             # Preserve index mapping: orders[0] is UP, orders[1] is DOWN.
@@ -595,7 +823,7 @@ class Btc15mArbBot:
 
             if submission_errors:
                 for msg in submission_errors:
-                    logger.error(f"❌ Order submit error: {msg}")
+                    logger.error("❌ Order submit error: %s", msg)
 
             if not order_ids_by_idx[0] or not order_ids_by_idx[1]:
                 # Can't reliably verify fills without ids; treat as failure.
@@ -607,8 +835,12 @@ class Btc15mArbBot:
             up_order_id, down_order_id = order_ids_by_idx[0], order_ids_by_idx[1]
             req_size = float(self.settings.order_size)
 
-            up_state = wait_for_terminal_order(self.settings, up_order_id, requested_size=req_size)
+            # Poll both legs concurrently so verification takes max(t_up, t_down).
+            up_wait = _io_executor.submit(
+                wait_for_terminal_order, self.settings, up_order_id, requested_size=req_size
+            )
             down_state = wait_for_terminal_order(self.settings, down_order_id, requested_size=req_size)
+            up_state = up_wait.result()
 
             up_filled = bool(up_state.get("filled"))
             down_filled = bool(down_state.get("filled"))
@@ -616,8 +848,9 @@ class Btc15mArbBot:
             down_filled_size = float(down_state.get("filled_size") or 0.0)
 
             logger.info(
-                f"Order status: UP(id={up_order_id}, status={up_state.get('status')}, filled={up_filled_size:.4f}) | "
-                f"DOWN(id={down_order_id}, status={down_state.get('status')}, filled={down_filled_size:.4f})"
+                "Order status: UP(id=%s, status=%s, filled=%.4f) | DOWN(id=%s, status=%s, filled=%.4f)",
+                up_order_id, up_state.get('status'), up_filled_size,
+                down_order_id, down_state.get('status'), down_filled_size,
             )
 
             if submission_errors or not (up_filled and down_filled):
@@ -625,7 +858,7 @@ class Btc15mArbBot:
                 try:
                     cancel_orders(self.settings, [up_order_id, down_order_id])
                 except Exception as cancel_exc:
-                    logger.warning(f"Cancel cleanup failed: {cancel_exc}")
+                    logger.warning("Cancel cleanup failed: %s", cancel_exc)
 
                 # If one leg filled, attempt to flatten exposure immediately.
                 filled_token_id = None
@@ -639,30 +872,11 @@ class Btc15mArbBot:
 
                 if filled_token_id and filled_size > 0:
                     logger.warning("⚠️ Partial fill detected; attempting to flatten exposure (SELL filled leg)")
-                    try:
-                        book = self.get_order_book(filled_token_id)
-                        best_bid = book.get("best_bid")
-                        if best_bid is None:
-                            raise RuntimeError("No best_bid available to unwind")
-                        # Marketable limit sell: price at or below best_bid.
-                        # Use FAK so we reduce exposure even if the bid is thin.
-                        place_order(
-                            self.settings,
-                            side="SELL",
-                            token_id=filled_token_id,
-                            price=float(best_bid),
-                            size=float(filled_size),
-                            tif="FAK",
-                        )
-                        logger.info(f"Submitted unwind SELL for {filled_size:.4f} @ bid={best_bid:.4f} (FAK)")
-                    except Exception as unwind_exc:
-                        logger.error(f"❌ Unwind attempt failed: {unwind_exc}")
+                    self._flatten_leg(filled_token_id, filled_size)
 
                 raise RuntimeError("Paired execution failed (not both legs filled)")
 
-            logger.info("\n" + "=" * 70)
-            logger.info("✅ ARBITRAGE EXECUTED (BOTH LEGS FILLED)")
-            logger.info("=" * 70)
+            logger.info("\n%s\n✅ ARBITRAGE EXECUTED (BOTH LEGS FILLED)\n%s", "=" * 70, "=" * 70)
 
             self.trades_executed += 1
             
@@ -671,34 +885,106 @@ class Btc15mArbBot:
             self.total_shares_bought += opportunity['order_size'] * 2  # UP + DOWN
             self.positions.append(opportunity)
             
-            # Update cached balance after trade
-            new_balance = self.get_balance()
-            self.cached_balance = new_balance
-            logger.info(f"💰 Updated balance: ${new_balance:.2f}")
+            # Posting invalidated both caches; refresh balance and positions in one round trip
+            snapshot = get_account_snapshot(self.settings, [self.yes_token_id, self.no_token_id])
+            logger.info("💰 Updated balance: $%.2f", snapshot["balance"])
             
-            # Get and show current positions
-            self.show_current_positions()
+            # Show current positions
+            self.show_current_positions(snapshot["positions"])
             
         except Exception as e:
-            logger.error(f"\n❌ Error executing arbitrage: {e}")
+            logger.error("\n❌ Error executing arbitrage: %s", e)
             logger.error("❌ Orders were NOT executed - tracking was not updated")
     
-    def show_current_positions(self):
-        """Show current share positions for UP and DOWN tokens."""
+    def _flatten_leg(self, token_id: str, size: float) -> None:
+        """Sell `size` shares of a leg that filled without its hedge."""
         try:
-            positions = get_positions(self.settings, [self.yes_token_id, self.no_token_id])
+            book = self.get_order_book(token_id)
+            best_bid = book.get("best_bid")
+            if best_bid is None:
+                raise RuntimeError("No best_bid available to unwind")
+            # Marketable limit sell: price at or below best_bid.
+            # Use FAK so we reduce exposure even if the bid is thin.
+            place_order(
+                self.settings,
+                side="SELL",
+                token_id=token_id,
+                price=float(best_bid),
+                size=float(size),
+                tif="FAK",
+            )
+            logger.info("Submitted unwind SELL for %.4f @ bid=%.4f (FAK)", size, best_bid)
+        except Exception as unwind_exc:
+            logger.error("❌ Unwind attempt failed: %s", unwind_exc)
+
+    def _settle_unconfirmed_submission(self, opportunity: dict, results: list) -> None:
+        """
+        Reconcile a submit that got no response, using the fills found in trade history.
+
+        The matched part of both legs is tracked as an executed pair; any excess on one
+        leg is sold back. If the fills could not be read, nothing is guessed.
+        """
+        filled = [r.get("filled_size") if isinstance(r, dict) else None for r in results[:2]]
+        up_filled, down_filled = (filled + [None, None])[:2]
+        if up_filled is None or down_filled is None:
+            logger.error(
+                "❌ Order submit timed out and fills could not be confirmed (UP=%s, DOWN=%s); "
+                "check positions before trading further",
+                up_filled, down_filled,
+            )
+            self.show_current_positions()
+            return
+
+        logger.warning(
+            "⚠️ Order submit timed out; trade history shows UP filled %.4f, DOWN filled %.4f",
+            up_filled, down_filled,
+        )
+        matched = min(up_filled, down_filled)
+        if up_filled > matched:
+            self._flatten_leg(self.yes_token_id, up_filled - matched)
+        elif down_filled > matched:
+            self._flatten_leg(self.no_token_id, down_filled - matched)
+
+        if matched <= 0:
+            logger.error("❌ No matched UP/DOWN pair filled - tracking was not updated")
+            return
+
+        investment = matched * opportunity['total_cost']
+        self.trades_executed += 1
+        self.total_invested += investment
+        self.total_shares_bought += matched * 2  # UP + DOWN
+        self.positions.append(
+            {**opportunity, "order_size": matched, "total_investment": investment, "expected_payout": matched}
+        )
+        logger.info("✅ Recorded %.4f filled pairs ($%.2f) from the timed-out submit", matched, investment)
+        self.show_current_positions()
+
+    async def execute_arbitrage_async(self, opportunity: dict):
+        """Run execute_arbitrage without blocking the event loop on order I/O."""
+        if self.settings.dry_run:
+            # Simulation does no network I/O; a thread hop would only add latency
+            self.execute_arbitrage(opportunity)
+            return
+        loop = asyncio.get_running_loop()
+        await loop.run_in_executor(_io_executor, self.execute_arbitrage, opportunity)
+
+    def show_current_positions(self, positions: Optional[dict] = None):
+        """Show current share positions for UP and DOWN tokens (fetched unless given)."""
+        try:
+            if positions is None:
+                positions = get_positions(self.settings, [self.yes_token_id, self.no_token_id])
             
             up_shares = positions.get(self.yes_token_id, {}).get("size", 0)
             down_shares = positions.get(self.no_token_id, {}).get("size", 0)
             
             logger.info("-" * 70)
             logger.info("📊 CURRENT POSITIONS:")
-            logger.info(f"   UP shares:   {up_shares:.2f}")
-            logger.info(f"   DOWN shares: {down_shares:.2f}")
+            logger.info("   UP shares:   %.2f", up_shares)
+            logger.info("   DOWN shares: %.2f", down_shares)
             logger.info("-" * 70)
             
         except Exception as e:
-            logger.warning(f"Could not fetch positions: {e}")
+            logger.warning("Could not fetch positions: %s", e)
     
     def get_market_result(self) -> Optional[str]:
         """Get which option won the market."""
@@ -721,28 +1007,35 @@ class Btc15mArbBot:
                 else:
                     return f"DOWN leading ({price_down:.2%})"
         except Exception as e:
-            logger.error(f"Error getting result: {e}")
+            logger.error("Error getting result: %s", e)
             return None
     
     def show_final_summary(self):
         """Show final summary when market closes."""
-        logger.info("\n" + "=" * 70)
-        logger.info("🏁 MARKET CLOSED - FINAL SUMMARY")
-        logger.info("=" * 70)
-        logger.info(f"Market: {self.market_slug}")
+        if not logger.isEnabledFor(logging.INFO):
+            # Nothing would be emitted; skip the formatting and the market result lookup
+            return
+        lines = [
+            "\n" + "=" * 70,
+            "🏁 MARKET CLOSED - FINAL SUMMARY",
+            "=" * 70,
+            f"Market: {self.market_slug}",
+        ]
         
         # Get market result
         result = self.get_market_result()
         if result:
-            logger.info(f"Result: {result}")
+            lines.append(f"Result: {result}")
         
-        logger.info(f"Mode: {'🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING'}")
-        logger.info("-" * 70)
-        logger.info(f"Total opportunities detected:    {self.opportunities_found}")
-        logger.info(f"Total trades executed:           {self.trades_executed if not self.settings.dry_run else self.opportunities_found}")
-        logger.info(f"Total shares bought:             {self.total_shares_bought}")
-        logger.info("-" * 70)
-        logger.info(f"Total invested:                  ${self.total_invested:.2f}")
+        lines += [
+            f"Mode: {'🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING'}",
+            "-" * 70,
+            f"Total opportunities detected:    {self.opportunities_found}",
+            f"Total trades executed:           {self.trades_executed if not self.settings.dry_run else self.opportunities_found}",
+            f"Total shares bought:             {self.total_shares_bought}",
+            "-" * 70,
+            f"Total invested:                  ${self.total_invested:.2f}",
+        ]
         
         # Calculate expected profit
         if self.settings.dry_run:
@@ -753,31 +1046,72 @@ class Btc15mArbBot:
         expected_profit = expected_payout - self.total_invested
         profit_pct = (expected_profit / self.total_invested * 100) if self.total_invested > 0 else 0
         
-        logger.info(f"Expected payout at close:        ${expected_payout:.2f}")
-        logger.info(f"Expected profit:                 ${expected_profit:.2f} ({profit_pct:.2f}%)")
+        lines.append(f"Expected payout at close:        ${expected_payout:.2f}")
+        lines.append(f"Expected profit:                 ${expected_profit:.2f} ({profit_pct:.2f}%)")
 
         if self.settings.dry_run:
             cash_remaining = float(self.sim_balance)
             cash_after_claim = cash_remaining + float(expected_payout)
             net_change = cash_after_claim - float(self.sim_start_balance)
             net_change_pct = (net_change / float(self.sim_start_balance) * 100) if self.sim_start_balance > 0 else 0
-            logger.info("-" * 70)
-            logger.info(f"Sim start cash:                  ${self.sim_start_balance:.2f}")
-            logger.info(f"Sim cash remaining:              ${cash_remaining:.2f}")
-            logger.info(f"Sim cash after claiming:         ${cash_after_claim:.2f}")
-            logger.info(f"Sim net change:                  ${net_change:.2f} ({net_change_pct:.2f}%)")
-        logger.info("=" * 70)
+            lines += [
+                "-" * 70,
+                f"Sim start cash:                  ${self.sim_start_balance:.2f}",
+                f"Sim cash remaining:              ${cash_remaining:.2f}",
+                f"Sim cash after claiming:         ${cash_after_claim:.2f}",
+                f"Sim net change:                  ${net_change:.2f} ({net_change_pct:.2f}%)",
+            ]
+        lines.append("=" * 70)
+        logger.info("\n".join(lines))
     
-    def run_once(self) -> bool:
-        """Scan once for opportunities."""
+    def _log_no_arbitrage(self, up_book: dict, down_book: dict, time_remaining: str) -> None:
+        """Log best-ask and fill-based pair costs for a scan without an opportunity."""
+        # Most-executed branch: skip the sums and fill-message formatting when INFO is off
+        if not logger.isEnabledFor(logging.INFO):
+            return
+        price_up = up_book.get("best_ask")
+        price_down = down_book.get("best_ask")
+        if price_up is None or price_down is None:
+            return
+
+        size_up = up_book.get("ask_size", 0)
+        size_down = down_book.get("ask_size", 0)
+        best_total = float(price_up) + float(price_down)
+
+        # Fill-based totals for ORDER_SIZE (more accurate than best_ask); reuses the
+        # walk check_arbitrage already did on these books, if any
+        fill_up, fill_down = self._buy_fills(up_book, down_book)
+
+        fill_msg = ""
+        if fill_up and fill_down and fill_up.get("worst") is not None and fill_down.get("worst") is not None:
+            worst_total = float(fill_up["worst"]) + float(fill_down["worst"])
+            vwap_total = float(fill_up["vwap"]) + float(fill_down["vwap"]) if (fill_up.get("vwap") is not None and fill_down.get("vwap") is not None) else None
+            if vwap_total is not None:
+                fill_msg = f" | fill(worst)=${worst_total:.4f} vwap=${vwap_total:.4f}"
+            else:
+                fill_msg = f" | fill(worst)=${worst_total:.4f}"
+
+        logger.info(
+            "No arbitrage: UP=$%.4f (%.0f) + DOWN=$%.4f (%.0f) = $%.4f (threshold=$%.3f)%s [Time: %s]",
+            price_up, size_up, price_down, size_down, best_total,
+            self.settings.target_pair_cost, fill_msg, time_remaining,
+        )
+
+    def run_once(self, remaining: Optional[float] = None) -> bool:
+        """Scan once for opportunities (`remaining` may be passed in if already computed)."""
+        if remaining is None:
+            remaining = self.seconds_remaining()
         # Check if market closed
-        time_remaining = self.get_time_remaining()
-        if time_remaining == "CLOSED":
+        if remaining is not None and remaining <= 0:
             return False  # Signal to stop the bot
+        time_remaining = format_remaining(remaining)
 
-        # Fetch both books once per scan (most expensive operations)
-        up_book = self.get_order_book(self.yes_token_id)
-        down_book = self.get_order_book(self.no_token_id)
+        # Fetch both books once per scan in one round-trip (most expensive operation)
+        try:
+            up_book, down_book = self._fetch_order_books()
+        except CircuitOpenError as e:
+            logger.debug("Skipping scan: %s", e)
+            return False
 
         opportunity = self.check_arbitrage(up_book=up_book, down_book=down_book)
         
@@ -785,105 +1119,72 @@ class Btc15mArbBot:
             self.execute_arbitrage(opportunity)
             return True
         else:
-            price_up = up_book.get("best_ask")
-            price_down = down_book.get("best_ask")
-            size_up = up_book.get("ask_size", 0)
-            size_down = down_book.get("ask_size", 0)
-
-            if price_up is not None and price_down is not None:
-                best_total = price_up + price_down
-
-                # Compute fill-based totals for ORDER_SIZE (more accurate than best_ask)
-                fill_up = self._compute_buy_fill(up_book.get("asks", []), float(self.settings.order_size))
-                fill_down = self._compute_buy_fill(down_book.get("asks", []), float(self.settings.order_size))
-
-                fill_msg = ""
-                if fill_up and fill_down and fill_up.get("worst") is not None and fill_down.get("worst") is not None:
-                    worst_total = float(fill_up["worst"]) + float(fill_down["worst"])
-                    vwap_total = float(fill_up["vwap"]) + float(fill_down["vwap"]) if (fill_up.get("vwap") is not None and fill_down.get("vwap") is not None) else None
-                    if vwap_total is not None:
-                        fill_msg = f" | fill(worst)=${worst_total:.4f} vwap=${vwap_total:.4f}"
-                    else:
-                        fill_msg = f" | fill(worst)=${worst_total:.4f}"
-
-                logger.info(
-                    f"No arbitrage: UP=${price_up:.4f} ({size_up:.0f}) + DOWN=${price_down:.4f} ({size_down:.0f}) "
-                    f"= ${best_total:.4f} (threshold=${self.settings.target_pair_cost:.3f}){fill_msg} "
-                    f"[Time: {time_remaining}]"
-                )
+            self._log_no_arbitrage(up_book, down_book, time_remaining)
             return False
 
-    async def run_once_async(self) -> bool:
+    async def run_once_async(self, remaining: Optional[float] = None) -> bool:
         """Scan once for opportunities (async; fetches books in parallel)."""
+        if remaining is None:
+            remaining = self.seconds_remaining()
         # Check if market closed
-        time_remaining = self.get_time_remaining()
-        if time_remaining == "CLOSED":
+        if remaining is not None and remaining <= 0:
             return False  # Signal to stop the bot
+        time_remaining = format_remaining(remaining)
 
         # Fetch both books concurrently (reduces per-scan latency)
-        up_book, down_book = await self._fetch_order_books_parallel()
+        try:
+            up_book, down_book = await self._fetch_order_books_parallel()
+        except CircuitOpenError as e:
+            # Sleep out the cooldown instead of spinning on a rejected call
+            logger.info("Skipping scan: %s", e)
+            await asyncio.sleep(self._book_breaker.retry_in())
+            return False
 
         opportunity = self.check_arbitrage(up_book=up_book, down_book=down_book)
 
         if opportunity:
-            self.execute_arbitrage(opportunity)
+            await self.execute_arbitrage_async(opportunity)
             return True
 
-        price_up = up_book.get("best_ask")
-        price_down = down_book.get("best_ask")
-        size_up = up_book.get("ask_size", 0)
-        size_down = down_book.get("ask_size", 0)
-
-        if price_up is not None and price_down is not None:
-            best_total = price_up + price_down
-
-            # Compute fill-based totals for ORDER_SIZE (more accurate than best_ask)
-            fill_up = self._compute_buy_fill(up_book.get("asks", []), float(self.settings.order_size))
-            fill_down = self._compute_buy_fill(down_book.get("asks", []), float(self.settings.order_size))
-
-            fill_msg = ""
-            if fill_up and fill_down and fill_up.get("worst") is not None and fill_down.get("worst") is not None:
-                worst_total = float(fill_up["worst"]) + float(fill_down["worst"])
-                vwap_total = float(fill_up["vwap"]) + float(fill_down["vwap"]) if (fill_up.get("vwap") is not None and fill_down.get("vwap") is not None) else None
-                if vwap_total is not None:
-                    fill_msg = f" | fill(worst)=${worst_total:.4f} vwap=${vwap_total:.4f}"
-                else:
-                    fill_msg = f" | fill(worst)=${worst_total:.4f}"
-
-            logger.info(
-                f"No arbitrage: UP=${price_up:.4f} ({size_up:.0f}) + DOWN=${price_down:.4f} ({size_down:.0f}) "
-                f"= ${best_total:.4f} (threshold=${self.settings.target_pair_cost:.3f}){fill_msg} "
-                f"[Time: {time_remaining}]"
-            )
-
+        self._log_no_arbitrage(up_book, down_book, time_remaining)
         return False
     
-    async def monitor(self, interval_seconds: int = 30):
+    async def monitor(self, interval_seconds: float = 30):
         """Continuously monitor for opportunities."""
         if getattr(self.settings, "use_wss", False):
             await self.monitor_wss()
             return
-        logger.info("=" * 70)
-        logger.info("🚀 BITCOIN 15MIN ARBITRAGE BOT STARTED")
-        logger.info("=" * 70)
-        logger.info(f"Market: {self.market_slug}")
-        logger.info(f"Time remaining: {self.get_time_remaining()}")
-        logger.info(f"Mode: {'🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING'}")
-        logger.info(f"Cost threshold: ${self.settings.target_pair_cost:.3f}")
-        logger.info(f"Order size: {self.settings.order_size} shares")
-        logger.info(f"Interval: {interval_seconds}s")
-        logger.info("=" * 70)
-        logger.info("")
+        logger.info(
+            "\n".join([
+                "=" * 70,
+                "🚀 BITCOIN 15MIN ARBITRAGE BOT STARTED",
+                "=" * 70,
+                f"Market: {self.market_slug}",
+                f"Time remaining: {self.get_time_remaining()}",
+                f"Mode: {'🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING'}",
+                f"Cost threshold: ${self.settings.target_pair_cost:.3f}",
+                f"Order size: {self.settings.order_size} shares",
+                f"Interval: {interval_seconds}s",
+                "=" * 70,
+                "",
+            ])
+        )
         
         scan_count = 0
+        # Scans are scheduled against a fixed anchor on the loop clock so that
+        # variable scan latency does not accumulate into drift.
+        loop = asyncio.get_running_loop()
+        next_wake = loop.time()
         
         try:
             while True:
                 scan_count += 1
-                logger.info(f"\n[Scan #{scan_count}] {datetime.now().strftime('%H:%M:%S')}")
+                logger.info("\n[Scan #%d] %s", scan_count, time.strftime('%H:%M:%S'))
+                # Deadline is read once per iteration and shared with the scan below
+                remaining = self.seconds_remaining()
                 
                 # Check if market closed
-                if self.get_time_remaining() == "CLOSED":
+                if remaining is not None and remaining <= 0:
                     logger.info("\n🚨 Market has closed!")
                     self.show_final_summary()
                     
@@ -892,10 +1193,9 @@ class Btc15mArbBot:
                     try:
                         new_market_slug = get_active_btc_15m_slug()
                         if new_market_slug != self.market_slug:
-                            logger.info(f"✅ New market found: {new_market_slug}")
-                            logger.info("Restarting bot with new market...")
-                            # Restart the bot with the new market
-                            self.__init__(self.settings)
+                            logger.info("✅ New market found: %s", new_market_slug)
+                            logger.info("Switching bot to new market...")
+                            self._rebind_market(new_market_slug)
                             scan_count = 0
                             continue
                         else:
@@ -903,28 +1203,39 @@ class Btc15mArbBot:
                             await asyncio.sleep(30)
                             continue
                     except Exception as e:
-                        logger.error(f"Error searching for new market: {e}")
+                        logger.error("Error searching for new market: %s", e)
                         logger.info("Retrying in 30 seconds...")
                         await asyncio.sleep(30)
                         continue
                 
                 # Use async scan to fetch books in parallel
-                await self.run_once_async()
+                await self.run_once_async(remaining)
                 
-                logger.info(f"Opportunities found: {self.opportunities_found}/{scan_count}")
+                logger.info("Opportunities found: %s/%s", self.opportunities_found, scan_count)
                 if not self.settings.dry_run:
-                    logger.info(f"Trades executed: {self.trades_executed}")
+                    logger.info("Trades executed: %s", self.trades_executed)
                 
-                logger.info(f"Waiting {interval_seconds}s...\n")
-                await asyncio.sleep(interval_seconds)
+                interval = interval_seconds
+                if remaining is not None and remaining < ENDGAME_SECONDS:
+                    interval = max(interval * ENDGAME_INTERVAL_FACTOR, MIN_SCAN_INTERVAL)
+                # Back off exponentially while book fetches keep failing
+                interval = max(interval, self._book_breaker.backoff())
+                next_wake += interval
+                now = loop.time()
+                if next_wake < now:
+                    # Scan overran its slot (or we just rolled over); re-anchor instead of bursting
+                    next_wake = now
+                delay = next_wake - now
+                logger.info("Waiting %.2fs...\n", delay)
+                await asyncio.sleep(delay)
                 
         except (KeyboardInterrupt, asyncio.CancelledError):
             logger.info("\n" + "=" * 70)
             logger.info("🛑 Bot stopped by user")
-            logger.info(f"Total scans: {scan_count}")
-            logger.info(f"Opportunities found: {self.opportunities_found}")
+            logger.info("Total scans: %s", scan_count)
+            logger.info("Opportunities found: %s", self.opportunities_found)
             if not self.settings.dry_run:
-                logger.info(f"Trades executed: {self.trades_executed}")
+                logger.info("Trades executed: %s", self.trades_executed)
             logger.info("=" * 70)
 
     def _book_from_state(self, bid_levels: list[tuple[float, float]], ask_levels: list[tuple[float, float]]) -> dict:
@@ -962,22 +1273,22 @@ class Btc15mArbBot:
         # This loop keeps WSS running across market rollovers.
         while True:
             # If the detected market is already closed, rollover immediately.
-            if self.get_time_remaining() == "CLOSED":
+            if self._market_closed():
                 logger.info("\n🚨 Market has closed (before WSS start).")
                 self.show_final_summary()
                 logger.info("\n🔄 Searching for next BTC 15min market...")
                 try:
                     new_market_slug = get_active_btc_15m_slug()
                     if new_market_slug != self.market_slug:
-                        logger.info(f"✅ New market found: {new_market_slug}")
-                        logger.info("Restarting bot with new market...")
-                        self.__init__(self.settings)
+                        logger.info("✅ New market found: %s", new_market_slug)
+                        logger.info("Switching bot to new market...")
+                        self._rebind_market(new_market_slug)
                         continue
                     logger.info("⏳ Waiting for new market... (10s)")
                     await asyncio.sleep(10)
                     continue
                 except Exception as e:
-                    logger.error(f"Error searching for new market: {e}")
+                    logger.error("Error searching for new market: %s", e)
                     logger.info("Retrying in 10 seconds...")
                     await asyncio.sleep(10)
                     continue
@@ -985,12 +1296,12 @@ class Btc15mArbBot:
             logger.info("=" * 70)
             logger.info("🚀 BITCOIN 15MIN ARBITRAGE BOT STARTED (WSS MODE)")
             logger.info("=" * 70)
-            logger.info(f"Market: {self.market_slug}")
-            logger.info(f"Time remaining: {self.get_time_remaining()}")
-            logger.info(f"Mode: {'🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING'}")
-            logger.info(f"Cost threshold: ${self.settings.target_pair_cost:.3f}")
-            logger.info(f"Order size: {self.settings.order_size} shares")
-            logger.info(f"WSS URL: {self.settings.ws_url}")
+            logger.info("Market: %s", self.market_slug)
+            logger.info("Time remaining: %s", self.get_time_remaining())
+            logger.info("Mode: %s", '🔸 SIMULATION' if self.settings.dry_run else '🔴 REAL TRADING')
+            logger.info("Cost threshold: $%.3f", self.settings.target_pair_cost)
+            logger.info("Order size: %s shares", self.settings.order_size)
+            logger.info("WSS URL: %s", self.settings.ws_url)
             logger.info("=" * 70)
             logger.info("")
 
@@ -999,14 +1310,23 @@ class Btc15mArbBot:
                 asset_ids=[self.yes_token_id, self.no_token_id],
             )
 
-            last_eval = 0.0
-            eval_min_interval_s = 0.05  # avoid evaluating too frequently on rapid deltas
             eval_count = 0
+            # Ask-side versions at the last evaluation; bid-only deltas can't create a buy opportunity
+            last_asks_versions = None
+
+            # Resolve per-market constants once instead of on every message
+            yes_token_id = self.yes_token_id
+            no_token_id = self.no_token_id
+            asset_labels = {yes_token_id: "UP", no_token_id: "DOWN"}
+            verbose = self.settings.verbose
+            get_book = client.get_book
+            book_from_state = self._book_from_state
+            check_arbitrage = self.check_arbitrage
 
             try:
                 async for asset_id, event_type in client.run():
                     # Periodic close check
-                    if self.get_time_remaining() == "CLOSED":
+                    if self._market_closed():
                         logger.info("\n🚨 Market has closed!")
                         self.show_final_summary()
                         # Roll over to next market
@@ -1014,81 +1334,65 @@ class Btc15mArbBot:
                         try:
                             new_market_slug = get_active_btc_15m_slug()
                             if new_market_slug != self.market_slug:
-                                logger.info(f"✅ New market found: {new_market_slug}")
-                                logger.info("Restarting bot with new market...")
-                                self.__init__(self.settings)
+                                logger.info("✅ New market found: %s", new_market_slug)
+                                logger.info("Switching bot to new market...")
+                                self._rebind_market(new_market_slug)
                                 break
                             logger.info("⏳ Waiting for new market... (10s)")
                             await asyncio.sleep(10)
                             break
                         except Exception as e:
-                            logger.error(f"Error searching for new market: {e}")
+                            logger.error("Error searching for new market: %s", e)
                             logger.info("Retrying in 10 seconds...")
                             await asyncio.sleep(10)
                             break
 
-                    # Debounce evaluation
-                    now = asyncio.get_running_loop().time()
-                    if (now - last_eval) < eval_min_interval_s:
-                        continue
-                    last_eval = now
-                    eval_count += 1
-                    logger.info(f"\n[WSS Eval #{eval_count}] {datetime.now().strftime('%H:%M:%S')} (trigger={event_type}:{asset_id[:8]}…)")
-
-                    yes_state = client.get_book(self.yes_token_id)
-                    no_state = client.get_book(self.no_token_id)
+                    yes_state = get_book(yes_token_id)
+                    no_state = get_book(no_token_id)
                     if not yes_state or not no_state:
-                        if self.settings.verbose:
+                        if verbose:
                             logger.info("WSS eval skipped: missing book state (waiting for initial snapshots)")
                         continue
 
+                    # Only re-run the arbitrage check when an ask side actually changed
+                    asks_versions = (yes_state.asks_version, no_state.asks_version)
+                    if asks_versions == last_asks_versions:
+                        continue
+                    last_asks_versions = asks_versions
+
+                    # client.run() yields once per drained batch of frames, so this
+                    # evaluates the freshest books once per burst (no time debounce that
+                    # could skip the last update of a burst).
+                    eval_count += 1
+                    if verbose:
+                        logger.info(
+                            "\n[WSS Eval #%d] %s (trigger=%s:%s)",
+                            eval_count, datetime.now().strftime('%H:%M:%S'), event_type, asset_labels.get(asset_id, "?"),
+                        )
+
                     yes_bids, yes_asks = yes_state.to_levels()
                     no_bids, no_asks = no_state.to_levels()
                     if not yes_asks or not no_asks:
-                        if self.settings.verbose:
+                        if verbose:
                             logger.info("WSS eval skipped: missing asks on one side (no buyable liquidity yet)")
                         continue
 
-                    up_book = self._book_from_state(yes_bids, yes_asks)
-                    down_book = self._book_from_state(no_bids, no_asks)
+                    up_book = book_from_state(yes_bids, yes_asks)
+                    down_book = book_from_state(no_bids, no_asks)
 
-                    opportunity = self.check_arbitrage(up_book=up_book, down_book=down_book)
+                    opportunity = check_arbitrage(up_book=up_book, down_book=down_book)
                     if opportunity:
-                        self.execute_arbitrage(opportunity)
+                        await self.execute_arbitrage_async(opportunity)
+                        # Re-check a standing opportunity on the next update (e.g. after cooldown)
+                        last_asks_versions = None
                         continue
 
                     # Minimal "no arb" logging using the same in-memory snapshot
-                    price_up = up_book.get("best_ask")
-                    price_down = down_book.get("best_ask")
-                    size_up = up_book.get("ask_size", 0)
-                    size_down = down_book.get("ask_size", 0)
-
-                    if price_up is not None and price_down is not None:
-                        best_total = float(price_up) + float(price_down)
-                        fill_up = self._compute_buy_fill(up_book.get("asks", []), float(self.settings.order_size))
-                        fill_down = self._compute_buy_fill(down_book.get("asks", []), float(self.settings.order_size))
-
-                        fill_msg = ""
-                        if fill_up and fill_down and fill_up.get("worst") is not None and fill_down.get("worst") is not None:
-                            worst_total = float(fill_up["worst"]) + float(fill_down["worst"])
-                            vwap_total = float(fill_up["vwap"]) + float(fill_down["vwap"]) if (fill_up.get("vwap") is not None and fill_down.get("vwap") is not None) else None
-                            if vwap_total is not None:
-                                fill_msg = f" | fill(worst)=${worst_total:.4f} vwap=${vwap_total:.4f}"
-                            else:
-                                fill_msg = f" | fill(worst)=${worst_total:.4f}"
-
-                        logger.info(
-                            f"No arbitrage: UP=${price_up:.4f} ({size_up:.0f}) + DOWN=${price_down:.4f} ({size_down:.0f}) "
-                            f"= ${best_total:.4f} (threshold=${self.settings.target_pair_cost:.3f}){fill_msg} "
-                            f"[Time: {self.get_time_remaining()}]"
-                        )
-                    else:
-                        if self.settings.verbose:
-                            logger.info("WSS eval skipped: best ask missing (book not ready)")
+                    self._log_no_arbitrage(up_book, down_book, self.get_time_remaining())
             except (KeyboardInterrupt, asyncio.CancelledError):
                 raise
             except Exception as e:
-                logger.warning(f"WSS monitor loop error, reconnecting: {e}")
+                logger.warning("WSS monitor loop error, reconnecting: %s", e)
                 await asyncio.sleep(1.0)
                 continue
 
@@ -1107,10 +1411,23 @@ async def main():
     # Create and run bot
     try:
         bot = Btc15mArbBot(settings)
-        await bot.monitor(interval_seconds=0)  # Scan continuously
+        start_keepalive(settings)
+        await bot.monitor(interval_seconds=max(settings.scan_interval_seconds, MIN_SCAN_INTERVAL))
     except Exception as e:
-        logger.error(f"❌ Fatal error: {e}", exc_info=True)
+        logger.error("❌ Fatal error: %s", e, exc_info=True)
+    finally:
+        # Release pooled keep-alive connections and worker threads
+        close_http()
+        _io_executor.shutdown(wait=False, cancel_futures=True)
+        close_client()
 
 
 if __name__ == "__main__":
+    try:
+        # libuv-based event loop: cheaper socket I/O and task scheduling (not available on Windows)
+        import uvloop
+
+        uvloop.install()
+    except ImportError:
+        pass
     asyncio.run(main())
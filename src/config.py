@@ -8,31 +8,65 @@ from dotenv import load_dotenv
 load_dotenv(override=False)
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Settings:
-    api_key: str = os.getenv("POLYMARKET_API_KEY", "")
-    api_secret: str = os.getenv("POLYMARKET_API_SECRET", "")
-    api_passphrase: str = os.getenv("POLYMARKET_API_PASSPHRASE", "")
-    private_key: str = os.getenv("POLYMARKET_PRIVATE_KEY", "")
-    signature_type: int = int(os.getenv("POLYMARKET_SIGNATURE_TYPE", "1"))
-    funder: str = os.getenv("POLYMARKET_FUNDER", "")
-    market_slug: str = os.getenv("POLYMARKET_MARKET_SLUG", "")
-    market_id: str = os.getenv("POLYMARKET_MARKET_ID", "")
-    yes_token_id: str = os.getenv("POLYMARKET_YES_TOKEN_ID", "")
-    no_token_id: str = os.getenv("POLYMARKET_NO_TOKEN_ID", "")
-    ws_url: str = os.getenv("POLYMARKET_WS_URL", "wss://ws-subscriptions-clob.polymarket.com")
-    use_wss: bool = os.getenv("USE_WSS", "false").lower() == "true"
-    target_pair_cost: float = float(os.getenv("TARGET_PAIR_COST", "0.99"))
-    balance_slack: float = float(os.getenv("BALANCE_SLACK", "0.15"))
-    order_size: float = float(os.getenv("ORDER_SIZE", "50"))
-    order_type: str = os.getenv("ORDER_TYPE", "FOK").upper()
-    yes_buy_threshold: float = float(os.getenv("YES_BUY_THRESHOLD", "0.45"))
-    no_buy_threshold: float = float(os.getenv("NO_BUY_THRESHOLD", "0.45"))
-    verbose: bool = os.getenv("VERBOSE", "false").lower() == "true"
-    dry_run: bool = os.getenv("DRY_RUN", "false").lower() == "true"
-    cooldown_seconds: float = float(os.getenv("COOLDOWN_SECONDS", "10"))
-    sim_balance: float = float(os.getenv("SIM_BALANCE", "0"))
+    api_key: str = ""
+    api_secret: str = ""
+    api_passphrase: str = ""
+    private_key: str = ""
+    signature_type: int = 1
+    funder: str = ""
+    market_slug: str = ""
+    market_id: str = ""
+    yes_token_id: str = ""
+    no_token_id: str = ""
+    ws_url: str = "wss://ws-subscriptions-clob.polymarket.com"
+    use_wss: bool = False
+    target_pair_cost: float = 0.99
+    balance_slack: float = 0.15
+    order_size: float = 50
+    order_type: str = "FOK"
+    yes_buy_threshold: float = 0.45
+    no_buy_threshold: float = 0.45
+    verbose: bool = False
+    dry_run: bool = False
+    cooldown_seconds: float = 10
+    scan_interval_seconds: float = 0.5
+    clob_timeout_seconds: float = 2.0
+    creds_cache_dir: str = ""
+    sim_balance: float = 0
+
+
+def _env_bool(name: str, default: str = "false") -> bool:
+    return os.getenv(name, default).lower() == "true"
 
 
 def load_settings() -> Settings:
-    return Settings()
+    """Snapshot the configuration from the environment (and .env) once."""
+    return Settings(
+        api_key=os.getenv("POLYMARKET_API_KEY", ""),
+        api_secret=os.getenv("POLYMARKET_API_SECRET", ""),
+        api_passphrase=os.getenv("POLYMARKET_API_PASSPHRASE", ""),
+        private_key=os.getenv("POLYMARKET_PRIVATE_KEY", ""),
+        signature_type=int(os.getenv("POLYMARKET_SIGNATURE_TYPE", "1")),
+        funder=os.getenv("POLYMARKET_FUNDER", ""),
+        market_slug=os.getenv("POLYMARKET_MARKET_SLUG", ""),
+        market_id=os.getenv("POLYMARKET_MARKET_ID", ""),
+        yes_token_id=os.getenv("POLYMARKET_YES_TOKEN_ID", ""),
+        no_token_id=os.getenv("POLYMARKET_NO_TOKEN_ID", ""),
+        ws_url=os.getenv("POLYMARKET_WS_URL", "wss://ws-subscriptions-clob.polymarket.com"),
+        use_wss=_env_bool("USE_WSS"),
+        target_pair_cost=float(os.getenv("TARGET_PAIR_COST", "0.99")),
+        balance_slack=float(os.getenv("BALANCE_SLACK", "0.15")),
+        order_size=float(os.getenv("ORDER_SIZE", "50")),
+        order_type=os.getenv("ORDER_TYPE", "FOK").upper(),
+        yes_buy_threshold=float(os.getenv("YES_BUY_THRESHOLD", "0.45")),
+        no_buy_threshold=float(os.getenv("NO_BUY_THRESHOLD", "0.45")),
+        verbose=_env_bool("VERBOSE"),
+        dry_run=_env_bool("DRY_RUN"),
+        cooldown_seconds=float(os.getenv("COOLDOWN_SECONDS", "10")),
+        scan_interval_seconds=float(os.getenv("SCAN_INTERVAL_SECONDS", "0.5")),
+        clob_timeout_seconds=float(os.getenv("CLOB_TIMEOUT_SECONDS", "2.0")),
+        creds_cache_dir=os.getenv("CREDS_CACHE_DIR", ""),
+        sim_balance=float(os.getenv("SIM_BALANCE", "0")),
+    )
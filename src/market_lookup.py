@@ -1,29 +1,106 @@
 """Fetch market and token IDs from a Polymarket event slug.
 
-Parses the event page https://polymarket.com/event/<slug> and returns
+Looks the slug up on the Gamma API (small JSON response) and falls back to
+parsing the event page https://polymarket.com/event/<slug>. Returns
 market id and CLOB token ids (order follows outcomes list).
 """
 
 import json
 import re
 from datetime import datetime
-from typing import Dict
+from typing import Dict, Optional
 
 import httpx
 
+# Shared keep-alive client for every polymarket.com / Gamma API lookup (including the
+# bot's slug discovery): rollovers repeat them, so reuse the TCP/TLS connections.
+_http = httpx.Client(
+    http2=True,
+    headers={"User-Agent": "Mozilla/5.0"},
+    timeout=10,
+    limits=httpx.Limits(max_keepalive_connections=4, max_connections=8),
+)
+
+
+_NEXT_DATA_RE = re.compile(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', re.DOTALL)
+_SLUG_TS_RE = re.compile(r"(.+-)(\d+)$")
+
+
+def http_client() -> httpx.Client:
+    """The shared polymarket.com / Gamma API client, for other discovery lookups."""
+    return _http
+
+
+def close_http() -> None:
+    """Close the shared lookup client (call once on shutdown)."""
+    _http.close()
+
+
+GAMMA_MARKETS_URL = "https://gamma-api.polymarket.com/markets"
+
+
+def _json_list(value) -> list:
+    # Gamma returns clobTokenIds/outcomes as JSON-encoded strings
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            return []
+    return value if isinstance(value, list) else []
+
+
+def _market_info(market: dict) -> Dict[str, str]:
+    clob_tokens = _json_list(market.get("clobTokenIds"))
+    outcomes = _json_list(market.get("outcomes"))
+    if len(clob_tokens) != 2 or len(outcomes) != 2:
+        raise RuntimeError("Expected binary market with two clob tokens")
+
+    return {
+        "market_id": market.get("id", ""),
+        "yes_token_id": clob_tokens[0],
+        "no_token_id": clob_tokens[1],
+        "outcomes": outcomes,
+        "question": market.get("question", ""),
+        "start_date": market.get("startDate"),
+        "end_date": market.get("endDate"),
+    }
+
+
+def fetch_market_from_gamma(slug: str) -> Dict[str, str]:
+    """Look up a market by exact slug on the Gamma API (~1 KB JSON instead of the HTML page)."""
+    slug = slug.split("?")[0]
+    resp = _http.get(GAMMA_MARKETS_URL, params={"slug": slug})
+    resp.raise_for_status()
+    data = resp.json()
+    for market in data if isinstance(data, list) else []:
+        if market.get("slug") == slug:
+            return _market_info(market)
+    raise RuntimeError(f"Market slug not found on Gamma API: {slug}")
+
+
+def extract_next_data(html: str) -> Optional[dict]:
+    """Return the page's __NEXT_DATA__ JSON payload, or None if absent."""
+    m = _NEXT_DATA_RE.search(html)
+    if not m:
+        return None
+    return json.loads(m.group(1))
+
 
 def fetch_market_from_slug(slug: str) -> Dict[str, str]:
     # Allow slugs that include query params (e.g., copied from the browser)
     slug = slug.split("?")[0]
+    try:
+        return fetch_market_from_gamma(slug)
+    except Exception:
+        pass
+
     url = f"https://polymarket.com/event/{slug}"
-    resp = httpx.get(url, headers={"User-Agent": "Mozilla/5.0"}, timeout=10)
+    resp = _http.get(url)
     resp.raise_for_status()
 
-    # Extract __NEXT_DATA__ JSON payload
-    m = re.search(r'<script id="__NEXT_DATA__"[^>]*>(.*?)</script>', resp.text, re.DOTALL)
-    if not m:
+    payload = extract_next_data(resp.text)
+    if payload is None:
         raise RuntimeError("__NEXT_DATA__ payload not found on page")
-    payload = json.loads(m.group(1))
 
     queries = payload.get("props", {}).get("pageProps", {}).get("dehydratedState", {}).get("queries", [])
     market = None
@@ -40,25 +117,12 @@ def fetch_market_from_slug(slug: str) -> Dict[str, str]:
     if not market:
         raise RuntimeError("Market slug not found in dehydrated state")
 
-    clob_tokens = market.get("clobTokenIds") or []
-    outcomes = market.get("outcomes") or []
-    if len(clob_tokens) != 2 or len(outcomes) != 2:
-        raise RuntimeError("Expected binary market with two clob tokens")
-
-    return {
-        "market_id": market.get("id", ""),
-        "yes_token_id": clob_tokens[0],
-        "no_token_id": clob_tokens[1],
-        "outcomes": outcomes,
-        "question": market.get("question", ""),
-        "start_date": market.get("startDate"),
-        "end_date": market.get("endDate"),
-    }
+    return _market_info(market)
 
 
 def next_slug(slug: str) -> str:
     # Increment the trailing epoch-like number by 900 seconds (15m)
-    m = re.match(r"(.+-)(\d+)$", slug)
+    m = _SLUG_TS_RE.match(slug)
     if not m:
         raise ValueError(f"Slug not in expected format: {slug}")
     prefix, num = m.groups()
@@ -1,61 +1,331 @@
-import functools
+import hashlib
+import json
 import logging
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Optional
 import time
 
+import httpx
+
 from py_clob_client.client import ClobClient
+from py_clob_client.exceptions import PolyApiException
+from py_clob_client.http_helpers import helpers as clob_http
 from py_clob_client.clob_types import (
+    ApiCreds,
     BalanceAllowanceParams,
     AssetType,
     OrderArgs,
     OrderType,
     PostOrdersArgs,
     PartialCreateOrderOptions,
+    TradeParams,
 )
 from py_clob_client.order_builder.constants import BUY, SELL
 
 from .config import Settings
+from .market_lookup import http_client
 
 logger = logging.getLogger(__name__)
 
+# BTC 15min markets are neg_risk but auto-detection via /neg-risk endpoint
+# often fails (returns "Invalid token id"). Force neg_risk=True for these markets.
+# This is safe: the worst case for non-neg_risk markets is a rejected order, not a bad signature.
+# create_order only reads the options, so one shared instance serves every order.
+_NEG_RISK_OPTIONS = PartialCreateOrderOptions(neg_risk=True)
+
+# Small shared pool for signing and posting order legs concurrently
+_post_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="clob-post")
+
+
+# One authenticated client per account; deriving API creds is a signed network call.
+_clients: dict[tuple[str, int, str], ClobClient] = {}
+_client_lock = threading.Lock()
+# Accounts whose creds came from the disk cache and no L2 call has accepted yet
+_unverified_creds: set[tuple[str, int, str]] = set()
+_keepalive_stop = threading.Event()
+KEEPALIVE_INTERVAL_SECONDS = 30.0
+
+
+def _client_key(settings: Settings) -> tuple[str, int, str]:
+    return (
+        settings.private_key.strip(),
+        settings.signature_type,
+        settings.funder.strip() if settings.funder else "",
+    )
 
-_cached_client = None
 
 def get_client(settings: Settings) -> ClobClient:
-    global _cached_client
-    
-    if _cached_client is not None:
-        return _cached_client
-    
+    key = _client_key(settings)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    # Order threads may race here on startup; only one of them derives creds.
+    with _client_lock:
+        client = _clients.get(key)
+        if client is None:
+            client = _build_client(settings, key)
+            _clients[key] = client
+    return client
+
+
+def _build_client(settings: Settings, key: tuple[str, int, str]) -> ClobClient:
     if not settings.private_key:
         raise RuntimeError("POLYMARKET_PRIVATE_KEY is required for trading")
     
     host = "https://clob.polymarket.com"
+
+    _apply_clob_timeout(settings.clob_timeout_seconds)
     
     # Create client with signature_type=1 for Magic/Email accounts
-    _cached_client = ClobClient(
+    client = ClobClient(
         host, 
-        key=settings.private_key.strip(), 
+        key=key[0], 
         chain_id=137, 
         signature_type=settings.signature_type, 
-        funder=settings.funder.strip() if settings.funder else None
+        funder=key[2] or None
     )
     
-    # Derive API credentials - simple method that works
-    logger.info("Deriving User API credentials from private key...")
-    derived_creds = _cached_client.create_or_derive_api_creds()
-    _cached_client.set_api_creds(derived_creds)
+    derived_creds = _load_cached_creds(settings)
+    if derived_creds is not None:
+        _unverified_creds.add(key)
+    else:
+        # Derive API credentials - simple method that works
+        logger.info("Deriving User API credentials from private key...")
+        derived_creds = client.create_or_derive_api_creds()
+        _store_cached_creds(settings, derived_creds)
+    client.set_api_creds(derived_creds)
     
     logger.info("✅ API credentials configured")
     logger.info(f"   API Key: {derived_creds.api_key}")
-    logger.info(f"   Wallet: {_cached_client.get_address()}")
+    logger.info(f"   Wallet: {client.get_address()}")
     logger.info(f"   Funder: {settings.funder}")
     
-    return _cached_client
+    return client
+
+
+def _apply_clob_timeout(seconds: float) -> None:
+    """Bound every CLOB request: posts, /books, order polling and creds derivation alike.
+
+    py-clob-client exposes no timeout option; all its requests go through one
+    module-level httpx.Client (httpx's default is 5s). An order that arrives late
+    may fill against a book that has already moved.
+    """
+    shared = getattr(clob_http, "_http_client", None)
+    if shared is None:
+        logger.warning("py-clob-client has no shared _http_client; CLOB_TIMEOUT_SECONDS not applied")
+        return
+    shared.timeout = httpx.Timeout(seconds)
+
+
+def _creds_cache_path(settings: Settings) -> Optional[str]:
+    if not settings.creds_cache_dir:
+        return None
+    # Never put the key itself in the file name
+    digest = hashlib.sha256(settings.private_key.strip().encode()).hexdigest()[:16]
+    return os.path.join(os.path.expanduser(settings.creds_cache_dir), f"creds-{digest}.json")
+
+
+def _load_cached_creds(settings: Settings) -> Optional[ApiCreds]:
+    """Derived creds are stable per private key; reuse them across restarts when opted in."""
+    path = _creds_cache_path(settings)
+    if path is None or not os.path.exists(path):
+        return None
+    try:
+        with open(path, encoding="utf-8") as f:
+            creds = ApiCreds(**json.load(f))
+    except (OSError, ValueError, TypeError) as e:
+        logger.warning(f"Ignoring unreadable creds cache {path}: {e}")
+        return None
+    logger.info(f"Loaded User API credentials from {path}")
+    return creds
+
+
+def _store_cached_creds(settings: Settings, creds: ApiCreds) -> None:
+    path = _creds_cache_path(settings)
+    if path is None:
+        return
+    try:
+        os.makedirs(os.path.dirname(path), mode=0o700, exist_ok=True)
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(
+                {"api_key": creds.api_key, "api_secret": creds.api_secret, "api_passphrase": creds.api_passphrase},
+                f,
+            )
+    except OSError as e:
+        logger.warning(f"Could not write creds cache {path}: {e}")
+
+
+def _refresh_cached_creds(settings: Settings, client: ClobClient) -> None:
+    """Replace rejected file-cached creds with freshly derived ones."""
+    path = _creds_cache_path(settings)
+    logger.warning(f"Cached API credentials rejected; deleting {path} and re-deriving")
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+    creds = client.create_or_derive_api_creds()
+    client.set_api_creds(creds)
+    _store_cached_creds(settings, creds)
 
 
-def get_balance(settings: Settings) -> float:
-    """Get USDC balance from Polymarket account."""
+def _with_creds_refresh(settings: Settings, client: ClobClient, func, *args):
+    """Run an L2 call; if file-cached creds get a 401/403 on first use, re-derive and retry once."""
+    key = _client_key(settings)
+    try:
+        result = func(*args)
+    except PolyApiException as exc:
+        if key not in _unverified_creds or exc.status_code not in (401, 403):
+            raise
+        with _client_lock:
+            if key in _unverified_creds:
+                _refresh_cached_creds(settings, client)
+        result = func(*args)
+    _unverified_creds.discard(key)
+    return result
+
+
+def warmup_client(settings: Settings) -> ClobClient:
+    """Build the client (creds, DNS, TLS) and prime the balance cache before trading starts."""
+    client = get_client(settings)
+    get_balance(settings)
+    return client
+
+
+def start_keepalive(settings: Settings, interval: float = KEEPALIVE_INTERVAL_SECONDS) -> threading.Thread:
+    """Ping the CLOB periodically so the idle keep-alive connection isn't dropped before an order."""
+    client = get_client(settings)
+    _keepalive_stop.clear()
+
+    def _run() -> None:
+        while not _keepalive_stop.wait(interval):
+            try:
+                client.get_ok()
+            except Exception as e:
+                logger.debug(f"Keepalive ping failed: {e}")
+
+    thread = threading.Thread(target=_run, name="clob-keepalive", daemon=True)
+    thread.start()
+    return thread
+
+
+def close_client() -> None:
+    """Drop cached clients and close the pooled HTTP/2 connection they share."""
+    _keepalive_stop.set()
+    with _client_lock:
+        _clients.clear()
+    # py-clob-client sends every request through one module-level httpx.Client
+    shared = getattr(clob_http, "_http_client", None)
+    if shared is not None:
+        shared.close()
+
+
+class _TtlCache:
+    """Per-key memo of recent API reads; entries expire after `ttl` seconds (monotonic)."""
+
+    __slots__ = ("ttl", "_entries", "_lock")
+
+    def __init__(self, ttl: float):
+        self.ttl = ttl
+        self._entries: dict = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, max_age: Optional[float] = None):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, fetched_at = entry
+        if time.monotonic() - fetched_at >= (self.ttl if max_age is None else max_age):
+            return None
+        return value
+
+    def put(self, key, value) -> None:
+        with self._lock:
+            self._entries[key] = (value, time.monotonic())
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+# Balance/position reads are signed API calls; reuse a recent value unless an order may
+# have changed it. Only successful reads are cached, keyed by account.
+BALANCE_TTL_SECONDS = 5.0
+POSITIONS_TTL_SECONDS = 1.0
+_balance_cache = _TtlCache(BALANCE_TTL_SECONDS)
+_positions_cache = _TtlCache(POSITIONS_TTL_SECONDS)
+
+
+def invalidate_balance_cache() -> None:
+    """Drop cached balances (call after anything that can move funds)."""
+    _balance_cache.clear()
+
+
+def invalidate_positions_cache() -> None:
+    """Drop cached positions (call after anything that can change holdings)."""
+    _positions_cache.clear()
+
+
+# Longest Retry-After we'll sleep through inside a read; beyond that, fail and let the caller move on
+MAX_RETRY_AFTER_SECONDS = 5.0
+_RETRYABLE_ERRORS = (PolyApiException, httpx.TransportError, httpx.HTTPStatusError)
+
+
+def _is_transient(exc: Exception) -> bool:
+    if isinstance(exc, httpx.TransportError):
+        return True
+    if isinstance(exc, httpx.HTTPStatusError):
+        code = exc.response.status_code
+    elif isinstance(exc, PolyApiException):
+        # status_code is None when no response arrived (timeout / reset)
+        code = exc.status_code
+    else:
+        return False
+    return code is None or code == 429 or code >= 500
+
+
+def _retry_after(exc: Exception) -> Optional[float]:
+    # Only httpx responses carry headers; py-clob-client's exception drops them
+    if not isinstance(exc, httpx.HTTPStatusError):
+        return None
+    try:
+        return float(exc.response.headers.get("Retry-After", ""))
+    except ValueError:
+        return None  # absent, or an HTTP-date
+
+
+def _with_retry(func, *args, retries: int = 2, backoff: float = 0.05):
+    """Call an idempotent read, retrying rate limits, 5xx and transport errors.
+
+    Other 4xx responses (bad auth, invalid params) are configuration problems and
+    are raised immediately. Never wrap order posts: a retried POST can double a fill.
+    A numeric Retry-After on an HTTP error response is honoured (up to
+    MAX_RETRY_AFTER_SECONDS; a longer one is raised instead of slept through).
+    """
+    for attempt in range(retries + 1):
+        try:
+            return func(*args)
+        except _RETRYABLE_ERRORS as exc:
+            if attempt == retries or not _is_transient(exc):
+                raise
+            delay = backoff * (2 ** attempt)
+            retry_after = _retry_after(exc)
+            if retry_after is not None:
+                if retry_after > MAX_RETRY_AFTER_SECONDS:
+                    raise
+                delay = max(delay, retry_after)
+            time.sleep(delay)
+
+
+def get_balance(settings: Settings, max_age: float = BALANCE_TTL_SECONDS) -> float:
+    """Get USDC balance from Polymarket account (cached for up to `max_age` seconds)."""
+    key = _client_key(settings)
+    cached = _balance_cache.get(key, max_age)
+    if cached is not None:
+        return cached
     try:
         client = get_client(settings)
         # Get USDC (COLLATERAL) balance
@@ -63,23 +333,26 @@ def get_balance(settings: Settings) -> float:
             asset_type=AssetType.COLLATERAL,
             signature_type=settings.signature_type
         )
-        result = client.get_balance_allowance(params)
+        # Usually the first L2 call (warmup), so it also validates disk-cached creds
+        result = _with_creds_refresh(settings, client, _with_retry, client.get_balance_allowance, params)
         
         if isinstance(result, dict):
-            balance_raw = result.get("balance", "0")
-            balance_wei = float(balance_raw)
-            # USDC has 6 decimals
-            balance_usdc = balance_wei / 1_000_000
+            # Integer string of base units; USDC has 6 decimals
+            balance_usdc = int(result.get("balance", 0)) / 1_000_000
+            _balance_cache.put(key, balance_usdc)
             return balance_usdc
         
         logger.warning(f"Respuesta inesperada obteniendo balance: {result}")
         return 0.0
+    except PolyApiException as e:
+        logger.error(f"Error getting balance: HTTP {e.status_code} {e.error_msg}")
+        return 0.0
     except Exception as e:
         logger.error(f"Error getting balance: {e}")
         return 0.0
 
 
-def place_order(settings: Settings, *, side: str, token_id: str, price: float, size: float, tif: str = "GTC") -> dict:
+def place_order(settings: Settings, *, side: str, token_id: str, price: float, size: float, tif: str = "FOK") -> dict:
     if price <= 0:
         raise ValueError("price must be > 0")
     if size <= 0:
@@ -102,21 +375,33 @@ def place_order(settings: Settings, *, side: str, token_id: str, price: float, s
             side=BUY if side_up == "BUY" else SELL
         )
         
-        # BTC 15min markets are neg_risk but auto-detection via /neg-risk endpoint
-        # often fails (returns "Invalid token id"). Force neg_risk=True for these markets.
-        # This is safe: the worst case for non-neg_risk markets is a rejected order, not a bad signature.
-        options = PartialCreateOrderOptions(neg_risk=True)
-        signed_order = client.create_order(order_args, options)
+        signed_order = client.create_order(order_args, _NEG_RISK_OPTIONS)
         
-        tif_up = (tif or "GTC").upper()
-        order_type = getattr(OrderType, tif_up, OrderType.GTC)
+        tif_up = (tif or "FOK").upper()
+        order_type = getattr(OrderType, tif_up, OrderType.FOK)
         return client.post_order(signed_order, order_type)
     except Exception as exc:  # pragma: no cover - passthrough from client
         raise RuntimeError(f"place_order failed: {exc}") from exc
+    finally:
+        # Even a failed post (e.g. a timeout) may have reached the book
+        invalidate_balance_cache()
+        invalidate_positions_cache()
 
 
 
-def place_orders_fast(settings: Settings, orders: list[dict], *, order_type: str = "GTC") -> list[dict]:
+def _sign_order(client: ClobClient, order_params: dict):
+    side_up = order_params["side"].upper()
+    order_args = OrderArgs(
+        token_id=order_params["token_id"],
+        price=order_params["price"],
+        size=order_params["size"],
+        side=BUY if side_up == "BUY" else SELL,
+    )
+    # Force neg_risk=True for BTC 15min markets (auto-detection fails)
+    return client.create_order(order_args, _NEG_RISK_OPTIONS)
+
+
+def place_orders_fast(settings: Settings, orders: list[dict], *, order_type: str = "FOK") -> list[dict]:
     """Place multiple orders as fast as possible.
 
     Strategy: pre-sign all orders first, then submit them together.
@@ -125,47 +410,106 @@ def place_orders_fast(settings: Settings, orders: list[dict], *, order_type: str
     Args:
         settings: Bot settings
         orders: List of order dicts with keys: side, token_id, price, size
-        order_type: One of OrderType: FOK, FAK, GTC, GTD
+        order_type: One of OrderType: FOK, FAK, GTC, GTD. Defaults to FOK so a leg that
+            arrives after the price moved is rejected by the venue instead of resting.
 
     Returns:
-        List of order results.
+        List of order results. If the batch post got no response, each leg is
+        {"error", "status": "unconfirmed", "filled_size"} where filled_size is what
+        the trade history shows was bought (None if that lookup failed too).
     """
     client = get_client(settings)
 
-    tif_up = (order_type or "GTC").upper()
-    ot = getattr(OrderType, tif_up, OrderType.GTC)
+    tif_up = (order_type or "FOK").upper()
+    ot = getattr(OrderType, tif_up, OrderType.FOK)
 
-    # Step 1: Pre-sign all orders (this is the slow part)
-    # Force neg_risk=True for BTC 15min markets (auto-detection fails)
-    options = PartialCreateOrderOptions(neg_risk=True)
-    signed_orders = []
-    for order_params in orders:
-        side_up = order_params["side"].upper()
-        order_args = OrderArgs(
-            token_id=order_params["token_id"],
-            price=order_params["price"],
-            size=order_params["size"],
-            side=BUY if side_up == "BUY" else SELL,
-        )
-        signed_order = client.create_order(order_args, options)
-        signed_orders.append(signed_order)
+    # Step 1: Pre-sign all orders (this is the slow part). Legs are signed concurrently:
+    # a tick-size/fee-rate cache miss inside create_order is a network round trip.
+    if len(orders) > 1:
+        signed_orders = list(_post_executor.map(lambda o: _sign_order(client, o), orders))
+    else:
+        signed_orders = [_sign_order(client, o) for o in orders]
 
     # Step 2: Post all orders in a single request when possible.
+    posted_at = time.time()
     try:
         args = [PostOrdersArgs(order=o, orderType=ot) for o in signed_orders]
         result = client.post_orders(args)
         if isinstance(result, list):
             return result
         return [result]
+    except PolyApiException as exc:
+        if exc.status_code is not None:
+            return _post_orders_individually(client, signed_orders, ot)
+        # Timed out / transport error: the batch may still have reached the book, so
+        # re-posting could double the position. Pull anything resting on these tokens,
+        # then ask the trade history what actually filled (FOK legs fill instantly).
+        logger.error(f"Batch order post failed without a response ({exc.error_msg}); cancelling")
+        _cancel_token_orders(client, {o["token_id"] for o in orders})
+        return [
+            {"error": f"post_orders: {exc.error_msg}", "status": "unconfirmed", "filled_size": filled}
+            for filled in _filled_since(client, orders, posted_at)
+        ]
     except Exception:
-        # Fallback to sequential posting if batch fails for any reason.
-        results: list[dict] = []
-        for signed_order in signed_orders:
-            try:
-                results.append(client.post_order(signed_order, ot))
-            except Exception as exc:
-                results.append({"error": str(exc)})
-        return results
+        return _post_orders_individually(client, signed_orders, ot)
+    finally:
+        # Any posted order may have locked or spent collateral
+        invalidate_balance_cache()
+        invalidate_positions_cache()
+
+
+def _post_orders_individually(client: ClobClient, signed_orders: list, ot) -> list[dict]:
+    # Fallback to individual posts when the batch is rejected; send the legs
+    # concurrently so the gap between them stays ~one RTT. Results keep input order.
+    submit, post = _post_executor.submit, client.post_order
+    futures = [submit(post, so, ot) for so in signed_orders]
+    results: list[dict] = [None] * len(futures)
+    for i, fut in enumerate(futures):
+        try:
+            results[i] = fut.result()
+        except Exception as exc:
+            results[i] = {"error": str(exc)}
+    return results
+
+
+def _cancel_token_orders(client: ClobClient, token_ids: set[str]) -> None:
+    """Cancel ALL of this account's resting orders on `token_ids`, not only this batch.
+
+    Used when a batch got no response, so its order ids are unknown. Any other
+    open orders the account has on these tokens are cancelled too.
+    """
+    for token_id in token_ids:
+        try:
+            client.cancel_market_orders(asset_id=token_id)
+        except Exception as exc:
+            logger.error(f"Failed to cancel orders for token {token_id}: {exc}")
+
+
+# Slack on the trade-history window: the local clock may run ahead of the CLOB's.
+# Executions are COOLDOWN_SECONDS (default 10s) apart, so earlier trades stay out of it.
+FILL_LOOKBACK_SECONDS = 5
+
+
+def _filled_since(client: ClobClient, orders: list[dict], since: float) -> list[Optional[float]]:
+    """Shares our taker trades filled per order leg since `since` (None where unknown)."""
+    filled: list[Optional[float]] = [None] * len(orders)
+    after = int(since) - FILL_LOOKBACK_SECONDS
+    for i, order_params in enumerate(orders):
+        token_id = order_params["token_id"]
+        side_up = order_params["side"].upper()
+        try:
+            trades = _with_retry(client.get_trades, TradeParams(asset_id=token_id, after=after))
+        except Exception as exc:
+            logger.error(f"Could not check fills for token {token_id}: {exc}")
+            continue
+        filled[i] = sum(
+            float(t.get("size") or 0)
+            for t in trades or ()
+            if t.get("asset_id") == token_id
+            and (t.get("side") or "").upper() == side_up
+            and (t.get("trader_side") or "TAKER").upper() == "TAKER"
+        )
+    return filled
 
 
 def extract_order_id(result: dict) -> Optional[str]:
@@ -293,9 +637,21 @@ def wait_for_terminal_order(
     return last_summary
 
 
+# ClobClient has no positions call; holdings come from the public data API
+DATA_API_POSITIONS_URL = "https://data-api.polymarket.com/positions"
+
+
+def _fetch_positions(user: str) -> list:
+    # sizeThreshold=0: the API hides positions under 1 share by default (partial fills)
+    resp = http_client().get(DATA_API_POSITIONS_URL, params={"user": user, "sizeThreshold": 0})
+    resp.raise_for_status()
+    data = resp.json()
+    return data if isinstance(data, list) else []
+
+
 def get_positions(settings: Settings, token_ids: list[str] = None) -> dict:
     """
-    Get current positions (shares owned) for the user.
+    Get current positions (shares owned) for the user from the Polymarket data API.
     
     Args:
         settings: Bot settings
@@ -304,27 +660,49 @@ def get_positions(settings: Settings, token_ids: list[str] = None) -> dict:
     Returns:
         Dictionary with token_id -> position data
     """
+    wanted = None if token_ids is None else frozenset(token_ids)
+    key = _client_key(settings)
+    cache_key = (key, wanted)
+    cached = _positions_cache.get(cache_key)
+    if cached is not None:
+        return cached
     try:
-        client = get_client(settings)
+        # Shares are held by the funder (proxy) wallet when one is configured
+        user = key[2] or get_client(settings).get_address()
+        positions = _with_retry(_fetch_positions, user)
         
-        # Get all positions for the user
-        positions = client.get_positions()
-        
-        # Filter by token_ids if provided
-        result = {}
-        for pos in positions:
-            token_id = pos.get("asset", {}).get("token_id") or pos.get("token_id")
-            if token_id:
-                if token_ids is None or token_id in token_ids:
-                    size = float(pos.get("size", 0))
-                    avg_price = float(pos.get("avg_price", 0))
-                    result[token_id] = {
-                        "size": size,
-                        "avg_price": avg_price,
-                        "raw": pos
-                    }
+        # Filter by token_ids if provided; "asset" is the outcome token id
+        result = {
+            token_id: {
+                "size": float(pos.get("size") or 0),
+                "avg_price": float(pos.get("avgPrice") or 0),
+                "raw": pos,
+            }
+            for pos in positions
+            if (token_id := pos.get("asset")) and (wanted is None or token_id in wanted)
+        }
         
+        _positions_cache.put(cache_key, result)
         return result
+    except httpx.HTTPStatusError as e:
+        logger.error(f"Error getting positions: HTTP {e.response.status_code}")
+        return {}
     except Exception as e:
         logger.error(f"Error getting positions: {e}")
         return {}
+
+
+def get_account_snapshot(settings: Settings, token_ids: list[str] = None) -> dict:
+    """
+    Fetch balance and positions together.
+
+    The balance (CLOB) and positions (data API) reads run concurrently, so the
+    snapshot costs one round trip instead of two. Both go through (and refill)
+    their TTL caches.
+
+    Returns:
+        {"balance": float, "positions": dict}
+    """
+    positions_future = _post_executor.submit(get_positions, settings, token_ids)
+    balance = get_balance(settings)
+    return {"balance": balance, "positions": positions_future.result()}
@@ -6,84 +6,120 @@ from typing import Any, Optional
 
 import websockets
 
+try:
+    # orjson decodes frames several times faster than the stdlib json module.
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:  # pragma: no cover - optional speedup
+    _loads = json.loads
+
 
 def _now_s() -> float:
     return time.time()
 
 
-@dataclass
+def _parse_timestamp_ms(ts: Any) -> Optional[int]:
+    if ts is None:
+        return None
+    try:
+        return int(ts)
+    except Exception:
+        return None
+
+
+def _parse_levels(levels: list[Any]) -> dict[float, float]:
+    """Parse snapshot levels (dicts or objects with price/size) into a price -> size map."""
+    out: dict[float, float] = {}
+    for lvl in levels:
+        try:
+            if isinstance(lvl, dict):
+                price = float(lvl["price"])
+                size = float(lvl["size"])
+            else:
+                price = float(lvl.price)
+                size = float(lvl.size)
+        except Exception:
+            continue
+        if size > 0:
+            out[price] = size
+    return out
+
+
+@dataclass(slots=True)
 class L2BookState:
     bids: dict[float, float] = field(default_factory=dict)  # price -> size
     asks: dict[float, float] = field(default_factory=dict)  # price -> size
     last_timestamp_ms: Optional[int] = None
     last_hash: Optional[str] = None
+    # Bumped whenever the ask side changes; consumers that only buy can skip bid-only deltas
+    asks_version: int = 0
+    # Sorted views built by to_levels(); reset on write so reads between updates don't re-sort
+    _bid_levels: Optional[list[tuple[float, float]]] = field(default=None, repr=False, compare=False)
+    _ask_levels: Optional[list[tuple[float, float]]] = field(default=None, repr=False, compare=False)
 
     def apply_snapshot(self, msg: dict[str, Any]) -> None:
         # Docs use bids/asks; some older tables mention buys/sells. Support both.
         bids = msg.get("bids") or msg.get("buys") or []
         asks = msg.get("asks") or msg.get("sells") or []
 
-        self.bids.clear()
-        self.asks.clear()
-
-        for lvl in bids:
-            try:
-                price = float(lvl["price"] if isinstance(lvl, dict) else lvl.price)
-                size = float(lvl["size"] if isinstance(lvl, dict) else lvl.size)
-            except Exception:
-                continue
-            if size <= 0:
-                continue
-            self.bids[price] = size
-
-        for lvl in asks:
-            try:
-                price = float(lvl["price"] if isinstance(lvl, dict) else lvl.price)
-                size = float(lvl["size"] if isinstance(lvl, dict) else lvl.size)
-            except Exception:
-                continue
-            if size <= 0:
-                continue
-            self.asks[price] = size
+        self.bids = _parse_levels(bids)
+        self.asks = _parse_levels(asks)
+        self.asks_version += 1
+        self._bid_levels = None
+        self._ask_levels = None
 
-        ts = msg.get("timestamp")
+        ts = _parse_timestamp_ms(msg.get("timestamp"))
         if ts is not None:
-            try:
-                self.last_timestamp_ms = int(ts)
-            except Exception:
-                pass
+            self.last_timestamp_ms = ts
         self.last_hash = msg.get("hash") or self.last_hash
 
     def apply_price_changes(self, msg: dict[str, Any]) -> None:
-        ts = msg.get("timestamp")
-        if ts is not None:
-            try:
-                self.last_timestamp_ms = int(ts)
-            except Exception:
-                pass
-
+        ts = _parse_timestamp_ms(msg.get("timestamp"))
         for ch in msg.get("price_changes", []) or []:
-            try:
-                price = float(ch.get("price"))
-                size = float(ch.get("size"))
-                side = str(ch.get("side", "")).upper()
-            except Exception:
-                continue
+            self.apply_price_change(ch, ts)
 
-            book = self.bids if side == "BUY" else self.asks
+    def apply_price_change(self, ch: dict[str, Any], timestamp_ms: Optional[int] = None) -> None:
+        """Apply a single price_change entry (one price level on one side)."""
+        if timestamp_ms is not None:
+            self.last_timestamp_ms = timestamp_ms
 
-            if size <= 0:
-                book.pop(price, None)
-            else:
-                book[price] = size
+        try:
+            price = float(ch["price"])
+            size = float(ch["size"])
+        except Exception:
+            return
+
+        if str(ch.get("side", "")).upper() == "BUY":
+            book = self.bids
+            self._bid_levels = None
+        else:
+            book = self.asks
+            self.asks_version += 1
+            self._ask_levels = None
 
-            # hash field refers to the order; keep as last_hash for debugging
-            if ch.get("hash"):
-                self.last_hash = ch.get("hash")
+        if size <= 0:
+            book.pop(price, None)
+        else:
+            book[price] = size
+
+        # hash field refers to the order; keep as last_hash for debugging
+        h = ch.get("hash")
+        if h:
+            self.last_hash = h
 
     def to_levels(self) -> tuple[list[tuple[float, float]], list[tuple[float, float]]]:
-        bid_levels = sorted(((p, s) for p, s in self.bids.items() if s > 0), key=lambda x: x[0], reverse=True)
-        ask_levels = sorted(((p, s) for p, s in self.asks.items() if s > 0), key=lambda x: x[0])
+        """Return (bids best-first, asks cheapest-first). Cached until the side changes; treat as read-only."""
+        bid_levels = self._bid_levels
+        if bid_levels is None:
+            bid_levels = self._bid_levels = sorted(
+                ((p, s) for p, s in self.bids.items() if s > 0), key=lambda x: x[0], reverse=True
+            )
+        ask_levels = self._ask_levels
+        if ask_levels is None:
+            ask_levels = self._ask_levels = sorted(
+                ((p, s) for p, s in self.asks.items() if s > 0), key=lambda x: x[0]
+            )
         return bid_levels, ask_levels
 
 
@@ -101,8 +137,37 @@ class MarketWssClient:
     def get_book(self, asset_id: str) -> Optional[L2BookState]:
         return self._books.get(asset_id)
 
+    def _on_book(self, msg: dict[str, Any]) -> Optional[tuple[str, str]]:
+        asset_id = msg.get("asset_id")
+        book = self._books.get(asset_id)
+        if book is None:
+            return None
+        book.apply_snapshot(msg)
+        return asset_id, "book"
+
+    def _on_price_change(self, msg: dict[str, Any]) -> Optional[tuple[str, str]]:
+        # price_change carries an array of changes, each includes asset_id.
+        # Apply each change to the right book.
+        books = self._books
+        ts = _parse_timestamp_ms(msg.get("timestamp"))
+        last_update = None
+        for ch in msg.get("price_changes", []) or []:
+            if not isinstance(ch, dict):
+                continue
+            aid = ch.get("asset_id")
+            book = books.get(aid)
+            if book is None:
+                continue
+            book.apply_price_change(ch, ts)
+            last_update = (aid, "price_change")
+        return last_update
+
     async def run(self):
-        """Async generator yielding (asset_id, event_type) for each processed message."""
+        """Async generator yielding (asset_id, event_type) of the last book update in each received batch.
+
+        Frames that are already queued when a message arrives are applied together,
+        so one yield can cover several updates (read the books via get_book()).
+        """
         url = f"{self.ws_base_url}/ws/market"
 
         # Throttle only the noisy connect attempts. Never throttle errors.
@@ -117,6 +182,9 @@ class MarketWssClient:
         # Avoid hanging forever on network/proxy/firewall issues
         open_timeout_s = 10
 
+        # Dispatch by event_type with one dict lookup per message
+        handlers = {"book": self._on_book, "price_change": self._on_price_change}
+
         # Basic reconnect loop
         while True:
             try:
@@ -127,6 +195,11 @@ class MarketWssClient:
                     ping_timeout=10,
                     open_timeout=open_timeout_s,
                     close_timeout=5,
+                    # Frames are small JSON; permessage-deflate only adds per-frame CPU.
+                    compression=None,
+                    # Let bursts queue up (and get drained in one batch) instead of
+                    # pausing the socket reader after the default 32 frames.
+                    max_queue=1024,
                 ) as ws:
                     # Subscribe to initial assets
                     # Per docs: type is "MARKET" and the field name is "assets_ids".
@@ -134,38 +207,39 @@ class MarketWssClient:
                     print(f"[WSS] Subscribed to {len(self.asset_ids)} asset_ids")
 
                     while True:
-                        raw = await ws.recv()
-                        payload = json.loads(raw)
-                        # Some servers may batch multiple events in a single message.
-                        msgs = payload if isinstance(payload, list) else [payload]
+                        frames = [await ws.recv()]
+                        # Drain frames that already arrived so a burst is applied in one pass
+                        # and the consumer evaluates once per batch instead of once per tick.
+                        # recv() returns without suspending while the internal queue is non-empty.
+                        pending = getattr(ws, "messages", None)
+                        while pending:
+                            frames.append(await ws.recv())
 
-                        for msg in msgs:
-                            if not isinstance(msg, dict):
+                        last_update: Optional[tuple[str, str]] = None
+                        for raw in frames:
+                            payload = _loads(raw)
+                            # Normalize once at the decode boundary: a single event object,
+                            # or a batch of events (some servers batch several per message).
+                            if type(payload) is dict:
+                                events = (payload,)
+                            elif type(payload) is list:
+                                events = payload
+                            else:
                                 continue
 
-                            event_type = msg.get("event_type")
-                            asset_id = msg.get("asset_id")
-
-                            if event_type == "book" and asset_id in self._books:
-                                self._books[asset_id].apply_snapshot(msg)
-                                yield asset_id, event_type
-                            elif event_type == "price_change":
-                                # price_change carries an array of changes, each includes asset_id.
-                                # Apply each change to the right book.
-                                ts = msg.get("timestamp")
-                                for ch in msg.get("price_changes", []) or []:
-                                    if not isinstance(ch, dict):
-                                        continue
-                                    aid = ch.get("asset_id")
-                                    if aid not in self._books:
-                                        continue
-                                    # Wrap into a per-asset message to reuse apply_price_changes
-                                    per_asset_msg = {"timestamp": ts, "price_changes": [ch]}
-                                    self._books[aid].apply_price_changes(per_asset_msg)
-                                    yield aid, event_type
-                            else:
+                            for msg in events:
+                                if type(msg) is not dict:
+                                    continue
                                 # ignore other event types (tick_size_change, last_trade_price, etc)
-                                continue
+                                handler = handlers.get(msg.get("event_type"))
+                                if handler is None:
+                                    continue
+                                update = handler(msg)
+                                if update is not None:
+                                    last_update = update
+
+                        if last_update is not None:
+                            yield last_update
 
             except asyncio.CancelledError:
                 raise